@@ -1,21 +1,50 @@
 'use client';
 
-import { Suspense } from 'react';
+import { Suspense, useEffect, useState } from 'react';
 import { useSearchParams } from 'next/navigation';
 import { useFlare } from '@/lib/context';
+import { loadReportBundle } from '@/lib/data-loader';
 import { buildChapterReport, buildCountyReport, buildRegionReport, buildDivisionReport } from '@/lib/report-data';
+import type { ReportBundle, ReportData } from '@/lib/report-data';
 import EntityReport from '@/components/report/EntityReport';
 
 function ReportPage() {
   const searchParams = useSearchParams();
-  const { counties, loading } = useFlare();
+  const { counties, loading, requestCounties } = useFlare();
 
   const division = searchParams.get('division');
   const region = searchParams.get('region');
   const chapter = searchParams.get('chapter');
   const county = searchParams.get('county');
 
-  if (loading) {
+  const level: ReportData['entityLevel'] | null =
+    division ? 'division' : region ? 'region' : chapter ? 'chapter' : county ? 'county' : null;
+  const key = division || region || chapter || county;
+
+  // Pre-built bundle first (one small fetch); null = not available, build from counties instead
+  const [bundle, setBundle] = useState<{ key: string; data: ReportBundle | null } | null>(null);
+  useEffect(() => {
+    if (!level || !key) return;
+    let cancelled = false;
+    loadReportBundle(level, key)
+      .then(data => { if (!cancelled) setBundle({ key: `${level}:${key}`, data }); })
+      .catch(() => { if (!cancelled) setBundle({ key: `${level}:${key}`, data: null }); });
+    return () => { cancelled = true; };
+  }, [level, key]);
+  const current = bundle && bundle.key === `${level}:${key}` ? bundle : null;
+
+  // by-county.json is only needed when the bundle is missing
+  const needCounties = current !== null && !current.data;
+  useEffect(() => {
+    if (needCounties) requestCounties();
+  }, [needCounties, requestCounties]);
+
+  if (current?.data) {
+    const generatedAt = new Date().toLocaleDateString('en-US', { year: 'numeric', month: 'long', day: 'numeric' });
+    return <EntityReport report={{ ...current.data, generatedAt }} />;
+  }
+
+  if (level && (!current || loading)) {
     return (
       <div className="min-h-screen bg-white flex items-center justify-center">
         <div className="text-center">
@@ -31,7 +60,7 @@ function ReportPage() {
     );
   }
 
-  if (!division && !region && !chapter && !county) {
+  if (!level) {
     return (
       <div className="min-h-screen bg-white flex items-center justify-center">
         <div className="text-center max-w-md">
@@ -3,11 +3,11 @@
 import { useEffect, useState, useMemo, useRef, useCallback } from 'react';
 import { Eye, EyeOff } from 'lucide-react';
 import { useFlare } from '@/lib/context';
-import { loadFirePoints, loadFireStations, loadStatesTopo, loadCountiesTopo } from '@/lib/data-loader';
-import { parseStatesTopo, parseCountiesTopo, getMetricColor, getLabelColor, LABEL_STATES, STATE_TO_FIPS, FIPS_TO_STATE, type GeoFeature } from '@/lib/geo-utils';
+import { loadFirePoints, loadFireStations, loadStatesTopo, loadNationalCountiesTopo, loadStateCountiesTopo, loadGeoBounds, loadGeoMetrics } from '@/lib/data-loader';
+import { parseStatesTopo, parseCountiesTopo, withDetailPaths, getMetricColor, getLabelColor, LABEL_STATES, STATE_TO_FIPS, FIPS_TO_STATE, type GeoFeature } from '@/lib/geo-utils';
 import { formatNumber, formatCompact, formatPercent, formatSvi, formatCurrency } from '@/lib/format';
 import { bucketBySvi, computeEquityGap } from '@/lib/svi';
-import type { FirePointsData, FireStationsData, CountyData } from '@/lib/types';
+import type { FirePointsData, FireStationsData, CountyData, GeoBounds, GeoMetric, GeoMetricsData } from '@/lib/types';
 import { CATEGORY_COLORS, CATEGORY_LABELS } from '@/lib/types';
 import SectionHeader from '@/components/ui/SectionHeader';
 import KpiCard from '@/components/ui/KpiCard';
@@ -31,6 +31,9 @@ const METRIC_OPTIONS: { key: ChoroplethMetric; label: string }[] = [
   { key: 'medianAge', label: 'Median Age' },
 ];
 
+// Metrics geo-metrics.json carries per feature (the rest are joined from the county rows)
+const GEO_METRICS = new Set<ChoroplethMetric>(['total', 'gapRate', 'careRate', 'firesPer10k', 'avgSvi']);
+
 const CATEGORY_RGB: Record<number, [number, number, number]> = {
   0: [34, 139, 34],   // care — vivid green
   1: [30, 100, 200],  // notification — bright blue
@@ -131,51 +134,55 @@ function DetailPanel({ entity, counties, onClose }: {
 }
 
 // Choropleth SVG Map
-function ChoroplethMap({ features, dataMap, metric, geoLevel, selectedFips, onSelect, filteredFips }: {
+function ChoroplethMap({ features, valueOf, metric, geoLevel, selectedFips, onSelect, filteredFips, bounds }: {
   features: GeoFeature[];
-  dataMap: Map<string, Record<string, number>>;
+  valueOf: (f: GeoFeature) => number;
   metric: ChoroplethMetric;
   geoLevel: GeoLevel;
   selectedFips: string | null;
   onSelect: (fips: string, name: string) => void;
   filteredFips: Set<string> | null;
+  bounds: GeoBounds | null;
 }) {
   const maxValue = useMemo(() => {
     let max = 0;
-    for (const d of dataMap.values()) {
-      const v = d[metric] || 0;
+    for (const f of features) {
+      if (filteredFips && !filteredFips.has(f.id)) continue;
+      const v = valueOf(f);
       if (v > max) max = v;
     }
     return max;
-  }, [dataMap, metric]);
+  }, [features, valueOf, filteredFips]);
 
   const metricType = metric;
 
-  // Auto-zoom viewBox when filtering
+  // Auto-zoom viewBox when filtering — fits the precomputed bboxes once bounds.json is in,
+  // padded centroids until then
   const viewBox = useMemo(() => {
     if (!filteredFips) return '0 0 975 610';
     const filtered = features.filter(f => filteredFips.has(f.id));
     if (filtered.length === 0) return '0 0 975 610';
+    const boxes = bounds ? (geoLevel === 'state' ? bounds.states : bounds.counties) : null;
 
     let minX = Infinity, maxX = -Infinity, minY = Infinity, maxY = -Infinity;
     for (const f of filtered) {
-      const [x, y] = f.centroid;
-      minX = Math.min(minX, x); maxX = Math.max(maxX, x);
-      minY = Math.min(minY, y); maxY = Math.max(maxY, y);
+      const box = boxes?.[f.id];
+      const [x0, y0, x1, y1] = box ? box.slice(2) : [f.centroid[0], f.centroid[1], f.centroid[0], f.centroid[1]];
+      minX = Math.min(minX, x0); maxX = Math.max(maxX, x1);
+      minY = Math.min(minY, y0); maxY = Math.max(maxY, y1);
     }
 
     const spanX = maxX - minX || 100;
     const spanY = maxY - minY || 60;
-    const pad = Math.max(spanX, spanY) * 0.4 + 80;
+    const pad = boxes ? Math.max(spanX, spanY) * 0.1 + 10 : Math.max(spanX, spanY) * 0.4 + 80;
 
     return `${Math.max(0, minX - pad)} ${Math.max(0, minY - pad)} ${Math.max(100, spanX + pad * 2)} ${Math.max(60, spanY + pad * 2)}`;
-  }, [features, filteredFips]);
+  }, [features, filteredFips, bounds, geoLevel]);
 
   return (
     <svg viewBox={viewBox} className="w-full" style={{ maxHeight: 500 }}>
       {features.map(f => {
-        const data = dataMap.get(f.id);
-        const value = data?.[metric] || 0;
+        const value = valueOf(f);
         const isFiltered = filteredFips ? filteredFips.has(f.id) : true;
         const fill = isFiltered ? getMetricColor(value, maxValue, metricType) : '#f0f0f0';
         const isSelected = f.id === selectedFips;
@@ -485,6 +492,9 @@ export default function GeographyTab() {
   const [selectedEntity, setSelectedEntity] = useState<{ name: string; fips: string } | null>(null);
   const [stateFeatures, setStateFeatures] = useState<GeoFeature[] | null>(null);
   const [countyFeatures, setCountyFeatures] = useState<GeoFeature[] | null>(null);
+  const [detailFeatures, setDetailFeatures] = useState<{ key: string; features: GeoFeature[] } | null>(null);
+  const [bounds, setBounds] = useState<GeoBounds | null>(null);
+  const [geoMetrics, setGeoMetrics] = useState<GeoMetricsData | null>(null);
   const [points, setPoints] = useState<FirePointsData | null>(null);
   const [stations, setStations] = useState<FireStationsData | null>(null);
   const [showStations, setShowStations] = useState(false);
@@ -493,7 +503,8 @@ export default function GeographyTab() {
   // Load geo data
   useEffect(() => {
     loadStatesTopo().then(topo => setStateFeatures(parseStatesTopo(topo)));
-    loadCountiesTopo().then(topo => setCountyFeatures(parseCountiesTopo(topo)));
+    loadNationalCountiesTopo().then(topo => setCountyFeatures(parseCountiesTopo(topo)));
+    loadGeoMetrics().then(setGeoMetrics).catch(() => {});
   }, []);
 
   // Lazy load points only when switching to points mode
@@ -510,38 +521,6 @@ export default function GeographyTab() {
     }
   }, [showStations, stations]);
 
-  // Build data maps for choropleth
-  const stateDataMap = useMemo(() => {
-    const map = new Map<string, Record<string, number>>();
-    const stateAgg = aggregateBy('state');
-    for (const row of stateAgg) {
-      const fips = STATE_TO_FIPS[row.name];
-      if (fips) {
-        map.set(fips, {
-          total: row.total, careRate: row.careRate, gapRate: row.gapRate,
-          avgSvi: row.avgSvi, firesPer10k: row.firesPer10k,
-          medianIncome: row.medianIncome, povertyRate: row.povertyRate,
-          homeValue: row.homeValue, medianAge: row.medianAge,
-        });
-      }
-    }
-    return map;
-  }, [aggregateBy]);
-
-  const countyDataMap = useMemo(() => {
-    const map = new Map<string, Record<string, number>>();
-    for (const c of filteredCounties) {
-      const povertyRate = c.population > 0 ? +((( c.poverty || 0) / c.population) * 100).toFixed(1) : 0;
-      map.set(c.fips, {
-        total: c.total, careRate: c.careRate, gapRate: c.gapRate,
-        avgSvi: c.avgSvi, firesPer10k: c.firesPer10k,
-        medianIncome: c.medianIncome, povertyRate,
-        homeValue: c.homeValue, medianAge: c.medianAge,
-      });
-    }
-    return map;
-  }, [filteredCounties]);
-
   // Filtered FIPS set — only highlight counties/states that match filters
   const filteredFips = useMemo(() => {
     if (!filters.division && !filters.region && !filters.chapter && !filters.state && !filters.county) return null;
@@ -553,6 +532,81 @@ export default function GeographyTab() {
     return set;
   }, [filteredCounties, filters]);
 
+  // Zoomed county view: detailed per-state topologies for the states in view (medium when
+  // several states share the viewport, full detail for one), drawn over the national file
+  const detailKey = useMemo(() => {
+    if (mapMode !== 'choropleth' || geoLevel !== 'county' || !filteredFips) return '';
+    return Array.from(filteredFips).filter(f => f.length === 2 && FIPS_TO_STATE[f]).sort().join(',');
+  }, [mapMode, geoLevel, filteredFips]);
+
+  useEffect(() => {
+    if (!detailKey) return;
+    const states = detailKey.split(',');
+    const level = states.length > 1 ? 'medium' : 'high';
+    let cancelled = false;
+    Promise.all(states.map(s => loadStateCountiesTopo(s, level).catch(() => null))).then(topos => {
+      if (cancelled) return;
+      const features = topos.flatMap(topo => (topo ? parseCountiesTopo(topo) : []));
+      setDetailFeatures({ key: detailKey, features });
+    });
+    return () => { cancelled = true; };
+  }, [detailKey]);
+
+  const shownCountyFeatures = useMemo(() => {
+    if (!countyFeatures || !detailFeatures || detailFeatures.key !== detailKey) return countyFeatures;
+    return withDetailPaths(countyFeatures, detailFeatures.features);
+  }, [countyFeatures, detailFeatures, detailKey]);
+
+  // Precomputed bboxes for the auto-zoom, only needed once a filter is set
+  useEffect(() => {
+    if (filteredFips && mapMode === 'choropleth' && !bounds) {
+      loadGeoBounds().then(setBounds).catch(() => {});
+    }
+  }, [filteredFips, mapMode, bounds]);
+
+  // Choropleth values. geo-metrics.json holds them per TopoJSON feature, so coloring is an array
+  // index: county values don't depend on the (geographic) filters, state values only hold while
+  // unfiltered. Demographic metrics, and states under a filter, are joined from the rows by FIPS.
+  const metricValues = useMemo(() => {
+    if (!geoMetrics || !GEO_METRICS.has(metric)) return null;
+    if (geoLevel === 'county') return geoMetrics.counties[metric as GeoMetric];
+    return filteredFips ? null : geoMetrics.states[metric as GeoMetric];
+  }, [geoMetrics, metric, geoLevel, filteredFips]);
+
+  const joinedData = useMemo(() => {
+    if (metricValues) return null;
+    const map = new Map<string, Record<string, number>>();
+    if (geoLevel === 'state') {
+      for (const row of aggregateBy('state')) {
+        const fips = STATE_TO_FIPS[row.name];
+        if (fips) {
+          map.set(fips, {
+            total: row.total, careRate: row.careRate, gapRate: row.gapRate,
+            avgSvi: row.avgSvi, firesPer10k: row.firesPer10k,
+            medianIncome: row.medianIncome, povertyRate: row.povertyRate,
+            homeValue: row.homeValue, medianAge: row.medianAge,
+          });
+        }
+      }
+    } else {
+      for (const c of filteredCounties) {
+        const povertyRate = c.population > 0 ? +((( c.poverty || 0) / c.population) * 100).toFixed(1) : 0;
+        map.set(c.fips, {
+          total: c.total, careRate: c.careRate, gapRate: c.gapRate,
+          avgSvi: c.avgSvi, firesPer10k: c.firesPer10k,
+          medianIncome: c.medianIncome, povertyRate,
+          homeValue: c.homeValue, medianAge: c.medianAge,
+        });
+      }
+    }
+    return map;
+  }, [metricValues, geoLevel, aggregateBy, filteredCounties]);
+
+  const valueOf = useCallback((f: GeoFeature) => {
+    if (metricValues) return metricValues[f.index] ?? 0;
+    return joinedData?.get(f.id)?.[metric] || 0;
+  }, [metricValues, joinedData, metric]);
+
   const handleSelect = useCallback((fips: string, name: string) => {
     setSelectedEntity(prev => prev?.fips === fips ? null : { fips, name });
   }, []);
@@ -693,22 +747,24 @@ export default function GeographyTab() {
               {geoLevel === 'state' && stateFeatures ? (
                 <ChoroplethMap
                   features={stateFeatures}
-                  dataMap={stateDataMap}
+                  valueOf={valueOf}
                   metric={metric}
                   geoLevel="state"
                   selectedFips={selectedEntity?.fips || null}
                   onSelect={handleSelect}
                   filteredFips={filteredFips}
+                  bounds={bounds}
                 />
-              ) : countyFeatures ? (
+              ) : shownCountyFeatures ? (
                 <ChoroplethMap
-                  features={countyFeatures}
-                  dataMap={countyDataMap}
+                  features={shownCountyFeatures}
+                  valueOf={valueOf}
                   metric={metric}
                   geoLevel="county"
                   selectedFips={selectedEntity?.fips || null}
                   onSelect={handleSelect}
                   filteredFips={filteredFips}
+                  bounds={bounds}
                 />
               ) : (
                 <div className="h-[500px] animate-pulse bg-arc-gray-100 rounded" />
@@ -307,6 +307,35 @@ export default function EntityReport({ report, onClose }: { report: ReportData;
           </section>
         )}
 
+        {/* 9b. Top Fire Departments (pre-built report bundles only) */}
+        {report.topDepartments && report.topDepartments.length > 0 && (
+          <section>
+            <h2 className="font-[family-name:var(--font-headline)] text-lg font-bold text-gray-900 mb-3">
+              Top Fire Departments
+            </h2>
+            <table className="w-full text-xs font-[family-name:var(--font-data)]">
+              <thead>
+                <tr className="border-b border-gray-200">
+                  <th className="text-left py-1.5 font-medium text-gray-500">Department</th>
+                  <th className="text-right py-1.5 font-medium text-gray-500">Fires</th>
+                  <th className="text-right py-1.5 font-medium text-gray-500">Care %</th>
+                  <th className="text-right py-1.5 font-medium text-gray-500">Gap %</th>
+                </tr>
+              </thead>
+              <tbody>
+                {report.topDepartments.map(d => (
+                  <tr key={d.name} className="border-b border-gray-100">
+                    <td className="py-1">{d.name}</td>
+                    <td className="text-right py-1">{formatNumber(d.total)}</td>
+                    <td className="text-right py-1">{formatPercent(d.careRate)}</td>
+                    <td className="text-right py-1">{formatPercent(d.gapRate)}</td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          </section>
+        )}
+
         {/* 10. Peer Comparison */}
         {report.peers.length > 0 && (
           <section>
@@ -314,7 +343,9 @@ export default function EntityReport({ report, onClose }: { report: ReportData;
               Peer Comparison
             </h2>
             <p className="text-xs text-gray-500 mb-2">
-              Compared against {report.peers.length} chapters with similar fire volume ({Math.round(report.total * 0.5)}–{Math.round(report.total * 1.5)} fires)
+              {report.peerBasis === 'profile'
+                ? <>Compared against the {report.peers.length} {report.entityLevel === 'county' ? 'counties' : 'chapters'} most similar in population, poverty, income, SVI and fire rate</>
+                : <>Compared against {report.peers.length} chapters with similar fire volume ({Math.round(report.total * 0.5)}–{Math.round(report.total * 1.5)} fires)</>}
             </p>
             <PeerTable peers={report.peers} entity={report} />
           </section>
@@ -1,11 +1,24 @@
 'use client';
 
+import { useCallback, useRef, useState } from 'react';
 import { X } from 'lucide-react';
 import { useFlare } from '@/lib/context';
+import { loadSearchIndex } from '@/lib/data-loader';
+import { createSearchIndex, type SearchIndex } from '@/lib/search-index';
 import SearchSelect from './SearchSelect';
 
 export default function FilterBar() {
   const { filters, setFilters, clearFilters, divisionOptions, regionOptions, chapterOptions, stateOptions, countyOptions } = useFlare();
+  const [searchIndex, setSearchIndex] = useState<SearchIndex | null>(null);
+  const searchIndexRequested = useRef(false);
+
+  // Ranked county typeahead, fetched the first time the picker opens;
+  // SearchSelect falls back to substring filtering until it loads
+  const loadCountySearch = useCallback(() => {
+    if (searchIndexRequested.current) return;
+    searchIndexRequested.current = true;
+    loadSearchIndex('county').then(data => setSearchIndex(createSearchIndex(data))).catch(() => {});
+  }, []);
 
   const hasFilters = filters.division || filters.region || filters.chapter || filters.state || filters.county;
 
@@ -61,6 +74,8 @@ export default function FilterBar() {
         onChange={fips => setFilters({ ...filters, county: fips })}
         placeholder="All Counties"
         ariaLabel="Filter by County"
+        searchIndex={searchIndex}
+        onOpen={loadCountySearch}
       />
 
       {/* State */}
@@ -2,18 +2,23 @@
 
 import { useState, useRef, useEffect, useMemo } from 'react';
 import { Search, X, ChevronDown } from 'lucide-react';
+import { searchEntities, type SearchIndex } from '@/lib/search-index';
 
 interface Option {
   label: string;
   value: string;
 }
 
-export default function SearchSelect({ options, value, onChange, placeholder, ariaLabel }: {
+export default function SearchSelect({ options, value, onChange, placeholder, ariaLabel, searchIndex, onOpen }: {
   options: Option[];
   value: string | null;
   onChange: (value: string | null) => void;
   placeholder: string;
   ariaLabel: string;
+  // Optional precomputed index (search-index-{kind}.json) — ranked by fire volume, no full-list scan
+  searchIndex?: SearchIndex | null;
+  // Called whenever the dropdown opens (e.g. to fetch searchIndex on first use)
+  onOpen?: () => void;
 }) {
   const [open, setOpen] = useState(false);
   const [query, setQuery] = useState('');
@@ -31,15 +36,22 @@ export default function SearchSelect({ options, value, onChange, placeholder, ar
     return () => document.removeEventListener('mousedown', handleClick);
   }, [open]);
 
+  const optionValues = useMemo(() => new Set(options.map(o => o.value)), [options]);
+
   const filtered = useMemo(() => {
     if (!query) return options.slice(0, 100); // Show first 100 when no search
+    if (searchIndex) {
+      return searchEntities(searchIndex, query, { values: optionValues, limit: 100 })
+        .map(r => ({ label: r.label, value: r.value }));
+    }
     const q = query.toLowerCase();
     return options.filter(o => o.label.toLowerCase().includes(q)).slice(0, 100);
-  }, [options, query]);
+  }, [options, optionValues, query, searchIndex]);
 
   const selectedLabel = value ? options.find(o => o.value === value)?.label : null;
 
   const handleOpen = () => {
+    onOpen?.();
     setOpen(true);
     setQuery('');
     setTimeout(() => inputRef.current?.focus(), 0);
@@ -2,8 +2,10 @@
 
 // FlareProvider — global data context for FLARE Analytics v2
 // Loads by-county.json once, provides filtered/aggregated data to all tabs
+// (on /report the load waits for requestCounties(), since a pre-built bundle usually suffices)
 
 import { createContext, useContext, useState, useEffect, useMemo, useCallback, type ReactNode } from 'react';
+import { usePathname } from 'next/navigation';
 import type { CountyData, FilterState, MetricMode, AggregatedRow } from './types';
 import { loadCounties } from './data-loader';
 import { filterCounties, aggregateCounties, computeNational, injectBenchmarks } from './aggregator';
@@ -13,6 +15,7 @@ interface FlareContextValue {
   // Raw data
   counties: CountyData[];
   loading: boolean;
+  requestCounties: () => void;
 
   // Filters
   filters: FilterState;
@@ -60,12 +63,16 @@ const EMPTY_HIERARCHY: OrgHierarchy = {
 const FlareContext = createContext<FlareContextValue | null>(null);
 
 export function FlareProvider({ children }: { children: ReactNode }) {
+  const pathname = usePathname();
   const [counties, setCounties] = useState<CountyData[]>([]);
   const [loading, setLoading] = useState(true);
+  const [countiesRequested, setCountiesRequested] = useState(false);
+  const shouldLoadCounties = countiesRequested || pathname !== '/report';
   const [filters, setFiltersState] = useState<FilterState>(EMPTY_FILTERS);
   const [metricMode, setMetricMode] = useState<MetricMode>('raw');
 
   useEffect(() => {
+    if (!shouldLoadCounties) return;
     loadCounties().then(data => {
       setCounties(data);
       setLoading(false);
@@ -73,7 +80,9 @@ export function FlareProvider({ children }: { children: ReactNode }) {
       console.error('Failed to load county data:', err);
       setLoading(false);
     });
-  }, []);
+  }, [shouldLoadCounties]);
+
+  const requestCounties = useCallback(() => setCountiesRequested(true), []);
 
   const hierarchy = useMemo(() => {
     if (counties.length === 0) return EMPTY_HIERARCHY;
@@ -179,7 +188,7 @@ export function FlareProvider({ children }: { children: ReactNode }) {
   }, [filteredCounties, filters, counties, national]);
 
   const value: FlareContextValue = {
-    counties, loading, filters, setFilters, clearFilters,
+    counties, loading, requestCounties, filters, setFilters, clearFilters,
     metricMode, setMetricMode,
     filteredCounties, national, filteredNational,
     aggregateBy, hierarchy,
@@ -1,8 +1,9 @@
 // Data loaders for FLARE Analytics v2
 // Primary source: by-county.json (2,997 records) — all aggregation done client-side
 
-import type { DailyData, FirePointsData, FireStationsData, CountyData } from './types';
+import type { DailyData, FirePointsData, FireStationsData, CountyData, GeoBounds, GeoMetricsData, GeoResolution, SearchIndexData, SearchKind } from './types';
 import type { Topology } from 'topojson-specification';
+import type { ReportBundle, ReportData } from './report-data';
 
 const cache = new Map<string, unknown>();
 
@@ -22,7 +23,20 @@ export const loadCounties = () => fetchJson<CountyData[]>('/data/by-county.json'
 export const loadFirePoints = () => fetchJson<FirePointsData>('/data/fires-points.json');
 export const loadFireStations = () => fetchJson<FireStationsData>('/data/fire-stations.json');
 export const loadDaily = () => fetchJson<DailyData[]>('/data/by-day.json');
+export const loadSearchIndex = (kind: SearchKind) => fetchJson<SearchIndexData>(`/data/search-index-${kind}.json`);
 
 // TopoJSON for choropleth
 export const loadStatesTopo = () => fetchJson<Topology>('/data/geo/states-albers-10m.json');
-export const loadCountiesTopo = () => fetchJson<Topology>('/data/geo/counties-albers-10m.json');
+export const loadGeoMetrics = () => fetchJson<GeoMetricsData>('/data/geo-metrics.json');
+
+// County TopoJSON split by scripts/build_geo.py — national view + per-state detail when zoomed in
+export const loadNationalCountiesTopo = () => fetchJson<Topology>('/data/geo/counties-low.json');
+export const loadStateCountiesTopo = (stateFips: string, level: Exclude<GeoResolution, 'low'> = 'high') =>
+  fetchJson<Topology>(`/data/geo/states/${stateFips}-${level}.json`);
+export const loadGeoBounds = () => fetchJson<GeoBounds>('/data/geo/bounds.json');
+
+// Pre-built /report bundles from scripts/report_bundles.py (keyed by FIPS for counties)
+export const reportSlug = (name: string) =>
+  name.toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/^-+|-+$/g, '');
+export const loadReportBundle = (level: ReportData['entityLevel'], key: string) =>
+  fetchJson<ReportBundle>(`/data/reports/${level}/${level === 'county' ? key : reportSlug(key)}.json`);
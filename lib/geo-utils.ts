@@ -31,6 +31,7 @@ export function countyFipsToStateFips(fips: string): string {
 
 export interface GeoFeature {
   id: string; // FIPS code
+  index: number; // geometry index in the source topology (geo-metrics.json arrays line up with it)
   abbr: string; // state abbreviation (for state features)
   name: string;
   path: string; // SVG path d attribute
@@ -79,12 +80,13 @@ function computeCentroid(geometry: GeoJSON.Geometry): [number, number] {
 export function parseStatesTopo(topo: Topology): GeoFeature[] {
   const geojson = feature(topo, topo.objects.states as GeometryCollection);
   return geojson.features
-    .map(f => {
+    .map((f, index) => {
       const fipsId = String(f.id).padStart(2, '0');
       const abbr = FIPS_TO_STATE[fipsId] || '';
       if (!abbr) return null;
       return {
         id: fipsId,
+        index,
         abbr,
         name: (f.properties as { name?: string })?.name || abbr,
         path: geometryToPath(f.geometry),
@@ -97,10 +99,11 @@ export function parseStatesTopo(topo: Topology): GeoFeature[] {
 // Parse county TopoJSON into SVG-ready features
 export function parseCountiesTopo(topo: Topology): GeoFeature[] {
   const geojson = feature(topo, topo.objects.counties as GeometryCollection);
-  return geojson.features.map(f => {
+  return geojson.features.map((f, index) => {
     const fipsId = String(f.id).padStart(5, '0');
     return {
       id: fipsId,
+      index,
       abbr: FIPS_TO_STATE[countyFipsToStateFips(fipsId)] || '',
       name: (f.properties as { name?: string })?.name || fipsId,
       path: geometryToPath(f.geometry),
@@ -109,6 +112,15 @@ export function parseCountiesTopo(topo: Topology): GeoFeature[] {
   });
 }
 
+// Swap in detailed paths (per-state files) for the counties they cover — order and ids unchanged
+export function withDetailPaths(features: GeoFeature[], detail: GeoFeature[]): GeoFeature[] {
+  const paths = new Map(detail.map(f => [f.id, f.path]));
+  return features.map(f => {
+    const path = paths.get(f.id);
+    return path ? { ...f, path } : f;
+  });
+}
+
 // Quantile color scales for choropleth metrics
 export function getMetricColor(
   value: number,
@@ -19,6 +19,16 @@ export interface PeerEntity {
   stationCount: number;
 }
 
+export interface ReportDepartment {
+  name: string;
+  total: number;
+  care: number;
+  notification: number;
+  gap: number;
+  careRate: number;
+  gapRate: number;
+}
+
 export interface ReportData {
   // Entity info
   entityName: string;
@@ -74,12 +84,20 @@ export interface ReportData {
 
   // Peer comparison (similar-sized entities)
   peers: PeerEntity[];
+  // 'profile' = k-nearest peers from peers.json (report bundles); default is similar fire volume
+  peerBasis?: 'volume' | 'profile';
+
+  // Top fire departments by volume (report bundles only — needs event-level data)
+  topDepartments?: ReportDepartment[];
 
   // Data quality
   missingDemographics: number; // counties with no census data
   missingStations: number; // counties with 0 stations
 }
 
+/** Pre-built report from scripts/report_bundles.py — generatedAt is stamped at render time */
+export type ReportBundle = Omit<ReportData, 'generatedAt'>;
+
 function toPeer(row: AggregatedRow): PeerEntity {
   return {
     name: row.name,
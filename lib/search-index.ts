@@ -0,0 +1,121 @@
+// Typeahead search for FLARE Analytics v2
+// Queries the precomputed search-index-{kind}.json files (scripts/search_index.py) — entries
+// are in fire-volume order, so intersecting postings lists yields results already ranked
+
+import type { SearchIndexData, SearchKind } from './types';
+
+export interface SearchResult {
+  kind: SearchKind;
+  label: string;
+  value: string;
+  total: number;
+}
+
+export interface SearchIndex {
+  data: SearchIndexData;
+  postings: Map<string, number[]>; // decoded lists, keyed 'p:' + prefix / 't:' + trigram
+  normalized: (string | undefined)[]; // normalized labels, filled on first use
+}
+
+/** Keep in sync with normalize_search() in scripts/search_index.py */
+export function normalizeSearch(text: string): string {
+  return text.normalize('NFKD').replace(/[\u0300-\u036f]/g, '').toLowerCase().replace(/[^a-z0-9]+/g, ' ').trim();
+}
+
+export function createSearchIndex(data: SearchIndexData): SearchIndex {
+  return { data, postings: new Map(), normalized: new Array(data.entries.label.length) };
+}
+
+function postings(index: SearchIndex, key: string): number[] | undefined {
+  const cached = index.postings.get(key);
+  if (cached) return cached;
+  const encoded = key.startsWith('p:') ? index.data.prefixes[key.slice(2)] : index.data.trigrams[key.slice(2)];
+  if (!encoded) return undefined;
+  const ids = new Array<number>(encoded.length);
+  let id = 0;
+  for (let i = 0; i < encoded.length; i++) {
+    id += encoded[i];
+    ids[i] = id;
+  }
+  index.postings.set(key, ids);
+  return ids;
+}
+
+function intersect(a: number[], b: number[]): number[] {
+  const out: number[] = [];
+  let i = 0, j = 0;
+  while (i < a.length && j < b.length) {
+    if (a[i] === b[j]) { out.push(a[i]); i++; j++; }
+    else if (a[i] < b[j]) i++;
+    else j++;
+  }
+  return out;
+}
+
+function normalizedLabel(index: SearchIndex, i: number): string {
+  let label = index.normalized[i];
+  if (label === undefined) {
+    label = normalizeSearch(index.data.entries.label[i]);
+    index.normalized[i] = label;
+  }
+  return label;
+}
+
+function toResult(index: SearchIndex, i: number): SearchResult {
+  const { label, value, total } = index.data.entries;
+  return { kind: index.data.kind, label: label[i], value: value[i] ?? label[i], total: total[i] };
+}
+
+/**
+ * Entities matching every word of the query — words under 3 characters match word starts,
+ * longer ones match anywhere. Labels starting with the query rank first, then by fire volume.
+ * `values` restricts results to those entity values (e.g. the counties left by other filters).
+ */
+export function searchEntities(
+  index: SearchIndex,
+  query: string,
+  { values, limit = 100 }: { values?: ReadonlySet<string>; limit?: number } = {},
+): SearchResult[] {
+  const { label: entryLabels, value: entryValues } = index.data.entries;
+  const allowed = (i: number) => !values || values.has(entryValues[i] ?? entryLabels[i]);
+  const q = normalizeSearch(query);
+
+  if (!q) {
+    const out: SearchResult[] = [];
+    for (let i = 0; i < entryLabels.length && out.length < limit; i++) {
+      if (allowed(i)) out.push(toResult(index, i));
+    }
+    return out;
+  }
+
+  const words = q.split(' ');
+  let candidates: number[] | null = null;
+  for (const word of words) {
+    const keys = word.length < 3
+      ? [`p:${word}`]
+      : Array.from({ length: word.length - 2 }, (_, j) => `t:${word.slice(j, j + 3)}`);
+    for (const key of keys) {
+      const list = postings(index, key);
+      if (!list) return [];
+      candidates = candidates ? intersect(candidates, list) : list;
+      if (candidates.length === 0) return [];
+    }
+  }
+
+  // Trigram hits can come from different parts of a label — confirm each word really matches
+  const starts: number[] = [];
+  const rest: number[] = [];
+  for (const i of candidates!) {
+    if (!allowed(i)) continue;
+    const label = normalizedLabel(index, i);
+    const padded = ` ${label}`;
+    if (!words.every(w => (w.length < 3 ? padded.includes(` ${w}`) : label.includes(w)))) continue;
+    if (label.startsWith(q)) {
+      starts.push(i);
+      if (starts.length >= limit) break;
+    } else if (rest.length < limit) {
+      rest.push(i);
+    }
+  }
+  return starts.concat(rest).slice(0, limit).map(i => toResult(index, i));
+}
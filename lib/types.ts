@@ -92,6 +92,44 @@ export interface FirePointsData {
   count: number;
 }
 
+// Simplification levels written by scripts/build_geo.py (see geo/manifest.json):
+// low = national counties file, medium/high = per-state files
+export type GeoResolution = 'low' | 'medium' | 'high';
+
+// [centroidX, centroidY, minX, minY, maxX, maxY] in pre-projected AlbersUSA units
+export type GeoBox = [number, number, number, number, number, number];
+
+export interface GeoBounds {
+  counties: Record<string, GeoBox>; // keyed by 5-digit county FIPS
+  states: Record<string, GeoBox>;   // keyed by 2-digit state FIPS
+}
+
+// Choropleth metrics pre-joined to TopoJSON features (geo-metrics.json):
+// arrays are in geometry order of counties-albers-10m (= counties-low) / states-albers-10m, null = no fires
+export type GeoMetric = 'total' | 'gapRate' | 'careRate' | 'firesPer10k' | 'avgSvi';
+
+export type GeoMetricLayer = { count: number; max: Record<GeoMetric, number> } & Record<GeoMetric, (number | null)[]>;
+
+export interface GeoMetricsData {
+  counties: GeoMetricLayer;
+  states: GeoMetricLayer;
+}
+
+// Typeahead index, one file per kind (search-index-{kind}.json): entries in fire-volume order,
+// postings delta-encoded
+export type SearchKind = 'county' | 'chapter' | 'region' | 'division' | 'state' | 'department';
+
+export interface SearchIndexData {
+  kind: SearchKind;
+  entries: {
+    label: string[];
+    value: (string | null)[]; // null = same as label
+    total: number[];
+  };
+  prefixes: Record<string, number[]>; // 1–2 char word starts
+  trigrams: Record<string, number[]>;
+}
+
 export interface CountyData {
   name: string;
   fips: string;
@@ -0,0 +1,282 @@
+"""
+FLARE Analytics Geo Build
+Splits public/data/geo/counties-albers-10m.json into per-state county topologies at several
+simplification levels, so maps fetch only the region and resolution they need:
+  - geo/counties-low.json                 all counties, simplified for the national view
+  - geo/states/{stateFips}-{level}.json   one state's counties (TopoJSON, object "counties") at
+                                          medium (multi-state zoom) and high (single state or less)
+  - geo/bounds.json                       per-FIPS [cx, cy, x0, y0, x1, y1] for counties + states
+  - geo/manifest.json                     levels and file sizes
+
+GeographyTab draws counties-low.json and, when a filter zooms the map in, swaps in the
+per-state files for the states in view.
+
+Coordinates stay in the pre-projected AlbersUSA space of the source (screen units, ~975 x 610),
+so tolerances below are in those units (~1 px on the unzoomed map). The source is already the
+10m-simplified us-atlas file and has ~9.5k arcs whose endpoints can't be dropped, so the
+national low level comes out at about half the source size (~140 KB gzipped vs ~255 KB). Arcs are simplified with Douglas-Peucker keeping
+their endpoints, which keeps shared county borders watertight; each output is re-quantized
+to its own bbox. States are processed in parallel across a process pool.
+
+Centroids are the area-weighted centroid of each feature's largest polygon.
+
+Usage:
+  python scripts/build_geo.py [--workers N]
+"""
+
+import argparse
+import json
+import os
+import time
+from multiprocessing import Pool
+
+from prepare_data import FIPS_TO_STATE, GEO_DIR
+
+SOURCE_FILE = os.path.join(GEO_DIR, "counties-albers-10m.json")
+STATES_DIR = os.path.join(GEO_DIR, "states")
+
+# level → (Douglas-Peucker tolerance in projected units, quantization)
+LEVELS = {
+    "low": (2.0, 1e3),
+    "medium": (0.5, 2e3),
+    "high": (0.0, 1e4),
+}
+# Levels written as a single national county file / per state
+NATIONAL_LEVELS = ("low",)
+STATE_LEVELS = ("medium", "high")
+
+# Worker state (set by _init_worker)
+_arcs = None
+_counties = None
+_states = None
+
+
+def decode_arcs(topo):
+    """Delta-decode and un-quantize TopoJSON arcs into lists of (x, y) floats."""
+    (kx, ky), (dx, dy) = topo["transform"]["scale"], topo["transform"]["translate"]
+    arcs = []
+    for arc in topo["arcs"]:
+        x = y = 0
+        points = []
+        for qx, qy in arc:
+            x += qx
+            y += qy
+            points.append((x * kx + dx, y * ky + dy))
+        arcs.append(points)
+    return arcs
+
+
+def _seg_dist2(p, a, b):
+    """Squared distance from p to segment a-b."""
+    ax, ay = a
+    vx, vy = b[0] - ax, b[1] - ay
+    wx, wy = p[0] - ax, p[1] - ay
+    length2 = vx * vx + vy * vy
+    t = 0.0 if length2 == 0 else max(0.0, min(1.0, (wx * vx + wy * vy) / length2))
+    ex, ey = wx - t * vx, wy - t * vy
+    return ex * ex + ey * ey
+
+
+def _douglas_peucker(points, start, end, tol2, keep):
+    stack = [(start, end)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        best, best_d = -1, tol2
+        for k in range(i + 1, j):
+            d = _seg_dist2(points[k], points[i], points[j])
+            if d > best_d:
+                best, best_d = k, d
+        if best >= 0:
+            keep[best] = True
+            stack.append((i, best))
+            stack.append((best, j))
+
+
+def simplify_arc(points, tolerance):
+    """Douglas-Peucker simplification keeping both endpoints (and a triangle for closed rings)."""
+    n = len(points)
+    if tolerance <= 0 or n <= 2:
+        return points
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    tol2 = tolerance * tolerance
+    if points[0] == points[-1]:
+        # Closed ring: split at the point farthest from the start so DP has a real chord,
+        # and keep enough vertices that the ring never collapses to a line
+        far = max(range(1, n - 1), key=lambda k: _seg_dist2(points[k], points[0], points[0]), default=0)
+        if far:
+            keep[far] = True
+            side = max(range(1, far), key=lambda k: _seg_dist2(points[k], points[0], points[far]), default=0)
+            if side:
+                keep[side] = True
+            _douglas_peucker(points, 0, far, tol2, keep)
+            _douglas_peucker(points, far, n - 1, tol2, keep)
+    else:
+        _douglas_peucker(points, 0, n - 1, tol2, keep)
+    return [p for p, k in zip(points, keep) if k]
+
+
+def _arc_indices(geometry):
+    """All arc indices (non-negative) referenced by a Polygon/MultiPolygon geometry."""
+    polys = geometry["arcs"] if geometry["type"] == "MultiPolygon" else [geometry["arcs"]]
+    return {a if a >= 0 else ~a for poly in polys for ring in poly for a in ring}
+
+
+def _remap(geometry, index):
+    def ring(r):
+        return [index[a] if a >= 0 else ~index[~a] for a in r]
+    if geometry["type"] == "MultiPolygon":
+        arcs = [[ring(r) for r in poly] for poly in geometry["arcs"]]
+    else:
+        arcs = [ring(r) for r in geometry["arcs"]]
+    out = {"type": geometry["type"], "arcs": arcs, "id": geometry["id"]}
+    if "properties" in geometry:
+        out["properties"] = geometry["properties"]
+    return out
+
+
+def build_topology(geometries, level):
+    """Subset + simplify + re-quantize arcs for the given county geometries."""
+    tolerance, quantization = LEVELS[level]
+    used = sorted({a for g in geometries for a in _arc_indices(g)})
+    index = {a: i for i, a in enumerate(used)}
+    arcs = [simplify_arc(_arcs[a], tolerance) for a in used]
+
+    xs = [x for arc in arcs for x, _ in arc]
+    ys = [y for arc in arcs for _, y in arc]
+    x0, y0, x1, y1 = min(xs), min(ys), max(xs), max(ys)
+    kx = (x1 - x0) / (quantization - 1) or 1
+    ky = (y1 - y0) / (quantization - 1) or 1
+
+    encoded = []
+    for arc in arcs:
+        closed = arc[0] == arc[-1]
+        quantized = []
+        for x, y in arc:
+            q = (round((x - x0) / kx), round((y - y0) / ky))
+            if not quantized or q != quantized[-1]:
+                quantized.append(q)
+        # Keep arcs valid after collapsing duplicate points (2+ points, 4+ for closed rings)
+        while len(quantized) < (4 if closed else 2):
+            quantized.append(quantized[-1])
+        px = py = 0
+        delta = []
+        for qx, qy in quantized:
+            delta.append([qx - px, qy - py])
+            px, py = qx, qy
+        encoded.append(delta)
+
+    return {
+        "type": "Topology",
+        "bbox": [round(x0, 3), round(y0, 3), round(x1, 3), round(y1, 3)],
+        "transform": {"scale": [kx, ky], "translate": [x0, y0]},
+        "objects": {"counties": {"type": "GeometryCollection", "geometries": [_remap(g, index) for g in geometries]}},
+        "arcs": encoded,
+    }
+
+
+def feature_bounds(geometry):
+    """[cx, cy, x0, y0, x1, y1]: area centroid of the largest polygon + full bbox (full resolution)."""
+    polys = geometry["arcs"] if geometry["type"] == "MultiPolygon" else [geometry["arcs"]]
+    best_area, centroid = -1.0, (0.0, 0.0)
+    xs, ys = [], []
+    for poly in polys:
+        ring = []
+        for a in poly[0]:
+            pts = _arcs[a] if a >= 0 else _arcs[~a][::-1]
+            ring.extend(pts if not ring else pts[1:])
+        xs.extend(x for x, _ in ring)
+        ys.extend(y for _, y in ring)
+        area2 = cx = cy = 0.0
+        for (xa, ya), (xb, yb) in zip(ring, ring[1:]):
+            cross = xa * yb - xb * ya
+            area2 += cross
+            cx += (xa + xb) * cross
+            cy += (ya + yb) * cross
+        if abs(area2) > best_area:
+            best_area = abs(area2)
+            if area2:
+                centroid = (cx / (3 * area2), cy / (3 * area2))
+            else:
+                centroid = (sum(x for x, _ in ring) / len(ring), sum(y for _, y in ring) / len(ring))
+    return [round(v, 1) for v in (*centroid, min(xs), min(ys), max(xs), max(ys))]
+
+
+def write_geo(path, topo):
+    with open(path, "w") as f:
+        json.dump(topo, f, separators=(",", ":"))
+    return os.path.getsize(path)
+
+
+def _init_worker(source_file):
+    global _arcs, _counties, _states
+    with open(source_file, "r") as f:
+        topo = json.load(f)
+    _arcs = decode_arcs(topo)
+    _counties = topo["objects"]["counties"]["geometries"]
+    _states = topo["objects"]["states"]["geometries"]
+
+
+def _run_task(task):
+    """One pool task: ("state", fips) → all levels + bounds, or ("nation", level) → one file."""
+    kind, key = task
+    if kind == "nation":
+        size = write_geo(os.path.join(GEO_DIR, f"counties-{key}.json"), build_topology(_counties, key))
+        return kind, key, {key: size}, {}, {}
+
+    geometries = [g for g in _counties if g["id"][:2] == key]
+    sizes = {
+        level: write_geo(os.path.join(STATES_DIR, f"{key}-{level}.json"), build_topology(geometries, level))
+        for level in STATE_LEVELS
+    }
+    county_bounds = {g["id"]: feature_bounds(g) for g in geometries}
+    state_bounds = {g["id"]: feature_bounds(g) for g in _states if g["id"] == key}
+    return kind, key, sizes, county_bounds, state_bounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    os.makedirs(STATES_DIR, exist_ok=True)
+    with open(SOURCE_FILE, "r") as f:
+        topo = json.load(f)
+    state_ids = sorted({g["id"][:2] for g in topo["objects"]["counties"]["geometries"]})
+    print(f"Loaded {SOURCE_FILE}: {len(topo['objects']['counties']['geometries']):,} counties, "
+          f"{len(topo['arcs']):,} arcs, {len(state_ids)} states")
+    del topo
+
+    tasks = [("nation", level) for level in NATIONAL_LEVELS] + [("state", s) for s in state_ids]
+    manifest = {
+        "levels": {level: {"tolerance": tol, "quantization": int(q)} for level, (tol, q) in LEVELS.items()},
+        "nation": {},
+        "states": {},
+    }
+    bounds = {"counties": {}, "states": {}}
+    with Pool(args.workers, initializer=_init_worker, initargs=(SOURCE_FILE,)) as pool:
+        for kind, key, sizes, county_bounds, state_bounds in pool.imap_unordered(_run_task, tasks):
+            if kind == "nation":
+                manifest["nation"].update(sizes)
+            else:
+                manifest["states"][key] = {"abbr": FIPS_TO_STATE.get(key, ""), "files": sizes}
+            bounds["counties"].update(county_bounds)
+            bounds["states"].update(state_bounds)
+
+    # Deterministic key order regardless of which worker finished first
+    manifest["states"] = dict(sorted(manifest["states"].items()))
+    bounds = {name: dict(sorted(b.items())) for name, b in bounds.items()}
+    write_geo(os.path.join(GEO_DIR, "bounds.json"), bounds)
+    write_geo(os.path.join(GEO_DIR, "manifest.json"), manifest)
+
+    total = sum(manifest["nation"].values()) + sum(sum(s["files"].values()) for s in manifest["states"].values())
+    print("  National levels: " + ", ".join(f"{lvl} {size:,} bytes" for lvl, size in manifest["nation"].items()))
+    print(f"  Wrote {len(manifest['states'])} states × {len(STATE_LEVELS)} levels + bounds for "
+          f"{len(bounds['counties']):,} counties ({total:,} bytes) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
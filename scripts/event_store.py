@@ -0,0 +1,356 @@
+"""
+FLARE Analytics Event Store
+Embedded SQLite copy of the enriched event table produced by prepare_data.py, so new cuts
+(e.g. department × chapter × month) are a SQL query instead of a full workbook re-run.
+
+Schema — one row per processed fire event:
+  events(day, month, fips, state_id, chapter_id, region_id, division_id,
+         label, svi, lat, lon, dept_id, nfirs)
+    day    = date ordinal (datetime.toordinal), month = YYYYMM integer (both NULL if no date)
+    fips   = county FIPS as given by the ZIP lookup (NULL if the ZIP didn't resolve)
+    label  = 0 care / 1 notification / 2 gap (same encoding as fires-points.json "cat")
+    nfirs  = 1 if the event had an NFIRS address match
+  states / chapters / regions / divisions / departments (id, name)
+  counties(fips, seq, name, state, chapter, region, division, + demographics)
+
+Dimension ids (and counties.seq) follow first-seen order in the workbook, which is the same
+tie-break order the JSON rollups use when sorting by -total. SVI sums are added up in Python
+over a rowid (= workbook order) scan rather than with SQL TOTAL(), so float rounding matches the
+workbook pass exactly and regenerated rollups are identical to prepare_data.py's.
+
+Usage:
+  python scripts/event_store.py                                # regenerate all rollups
+  python scripts/event_store.py by-county.json by-state.json   # regenerate selected rollups
+
+From Python:
+  store = EventStore()
+  store.query("SELECT d.name, c.name, e.month, COUNT(*) FROM events e "
+              "JOIN departments d ON d.id = e.dept_id JOIN chapters c ON c.id = e.chapter_id "
+              "GROUP BY 1, 2, 3")
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import date as date_cls
+
+from prepare_data import EVENT_STORE_FILE, build_rollups, new_accumulators, write_json
+from search_index import search_index_filename
+
+LABELS = ("care", "notification", "gap")
+
+# Dimension tables, interned in first-seen order
+DIMENSIONS = ("states", "chapters", "regions", "divisions", "departments")
+
+# county_demographics.json key → counties column
+DEMOGRAPHIC_COLUMNS = {
+    "p": "population",
+    "i": "median_income",
+    "hh": "households",
+    "pov": "poverty",
+    "age": "median_age",
+    "div": "diversity_index",
+    "hv": "home_value",
+}
+
+SCHEMA = """
+CREATE TABLE events (
+    day INTEGER,
+    month INTEGER,
+    fips TEXT,
+    state_id INTEGER,
+    chapter_id INTEGER,
+    region_id INTEGER,
+    division_id INTEGER,
+    label INTEGER NOT NULL,
+    svi REAL,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    dept_id INTEGER NOT NULL,
+    nfirs INTEGER NOT NULL
+);
+CREATE TABLE counties (
+    fips TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    name TEXT, state TEXT, chapter TEXT, region TEXT, division TEXT,
+    -- untyped so census values round-trip exactly (ints stay ints, 39.0 stays a float)
+    population, median_income, households, poverty, median_age, diversity_index, home_value
+);
+""" + "".join(
+    f"CREATE TABLE {dim} (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);\n" for dim in DIMENSIONS
+)
+
+# Covering indexes: hierarchy/time key first, then the columns every rollup reads
+INDEXES = """
+CREATE INDEX idx_events_county ON events (fips, month, label, svi);
+CREATE INDEX idx_events_state ON events (state_id, month, label, svi);
+CREATE INDEX idx_events_chapter ON events (chapter_id, month, label, svi);
+CREATE INDEX idx_events_region ON events (region_id, month, label, svi);
+CREATE INDEX idx_events_division ON events (division_id, month, label, svi);
+CREATE INDEX idx_events_month ON events (month, label, svi);
+CREATE INDEX idx_events_day ON events (day, label);
+CREATE INDEX idx_events_dept ON events (dept_id, label, svi);
+"""
+
+# Accumulators each rollup reads (everything else can stay empty)
+ROLLUP_SOURCES = {
+    "summary.json": ("totals", "by_dept", "by_state"),
+    "funnel.json": ("funnel",),
+    "by-state.json": ("by_state",),
+    "by-month.json": ("monthly",),
+    "by-day.json": ("daily",),
+    "by-department.json": ("by_dept",),
+    "gap-analysis.json": ("by_state",),
+    "risk-distribution.json": ("svi_bins",),
+    "by-county.json": ("by_county", "county_meta"),
+    "by-chapter.json": ("by_chapter", "county_meta"),
+    "by-region.json": ("by_region", "county_meta"),
+    "by-division.json": ("by_division", "county_meta"),
+    "peers.json": ("by_county", "by_chapter", "county_meta"),
+    "geo-metrics.json": ("by_county", "county_meta", "by_state"),
+    search_index_filename("county"): ("by_county", "county_meta"),
+    search_index_filename("chapter"): ("by_chapter", "county_meta"),
+    search_index_filename("region"): ("by_region", "county_meta"),
+    search_index_filename("division"): ("by_division", "county_meta"),
+    search_index_filename("state"): ("by_state",),
+    search_index_filename("department"): ("by_dept",),
+}
+
+
+class EventStoreWriter:
+    """Streams enriched events into a fresh store; swapped into place on close().
+
+    append=True starts from a copy of the existing store instead (watch.py adding new workbook
+    rows): dimension ids are kept, and dimensions, counties and indexes are rewritten on close().
+    """
+
+    def __init__(self, path=EVENT_STORE_FILE, batch_size=50000, append=False):
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        if append:
+            shutil.copyfile(path, self.tmp_path)
+        self.conn = sqlite3.connect(self.tmp_path)
+        self.conn.execute("PRAGMA journal_mode = OFF")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.batch_size = batch_size
+        self.batch = []
+        self.dims = {dim: {} for dim in DIMENSIONS}
+        if append:
+            for dim in DIMENSIONS:
+                self.dims[dim] = {name: i for i, name in self.conn.execute(f"SELECT id, name FROM {dim} ORDER BY id")}
+                self.conn.execute(f"DELETE FROM {dim}")
+            self.conn.execute("DELETE FROM counties")
+            indexes = self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")
+            for (name,) in indexes.fetchall():
+                self.conn.execute(f"DROP INDEX {name}")
+            (self.count,) = self.conn.execute("SELECT COUNT(*) FROM events").fetchone()
+        else:
+            self.conn.executescript(SCHEMA)
+            self.count = 0
+
+    def _dim_id(self, dim, name):
+        if not name:
+            return None
+        ids = self.dims[dim]
+        if name not in ids:
+            ids[name] = len(ids)
+        return ids[name]
+
+    def add(self, date, county_fips, state, chapter, region, division, cat_idx, svi, lat, lon, dept, nfirs):
+        """Append one processed event (values as computed in the prepare_data row loop)."""
+        self.batch.append((
+            date.toordinal() if date else None,
+            date.year * 100 + date.month if date else None,
+            county_fips or None,
+            self._dim_id("states", state),
+            self._dim_id("chapters", chapter),
+            self._dim_id("regions", region),
+            self._dim_id("divisions", division),
+            cat_idx,
+            svi,
+            lat,
+            lon,
+            self._dim_id("departments", dept),
+            1 if nfirs else 0,
+        ))
+        if len(self.batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        self.conn.executemany("INSERT INTO events VALUES (" + ",".join("?" * 13) + ")", self.batch)
+        self.count += len(self.batch)
+        self.batch = []
+
+    def close(self, county_meta, demographics):
+        """Write dimensions + county metadata, build indexes and atomically replace the store."""
+        self._flush()
+        for dim, ids in self.dims.items():
+            self.conn.executemany(f"INSERT INTO {dim} (id, name) VALUES (?, ?)", [(i, n) for n, i in ids.items()])
+
+        county_rows = []
+        for seq, (fips, meta) in enumerate(county_meta.items()):
+            demo = demographics.get(fips, {})
+            county_rows.append((
+                fips, seq, meta["name"], meta["state"], meta["chapter"], meta["region"], meta["division"],
+                *(demo.get(key) for key in DEMOGRAPHIC_COLUMNS),
+            ))
+        self.conn.executemany("INSERT INTO counties VALUES (" + ",".join("?" * 14) + ")", county_rows)
+
+        self.conn.executescript(INDEXES)
+        self.conn.execute("ANALYZE")
+        self.conn.commit()
+        self.conn.close()
+        os.replace(self.tmp_path, self.path)
+        size = os.path.getsize(self.path)
+        print(f"  Wrote event store {os.path.basename(self.path)}: {self.count:,} events, {size:,} bytes")
+
+
+def _month_key(month):
+    return f"{month // 100:04d}-{month % 100:02d}"
+
+
+def _fill_counts(target, label, n):
+    target[LABELS[label]] += n
+    target["total"] += n
+
+
+class EventStore:
+    """Read-side query API over the event store."""
+
+    def __init__(self, path=EVENT_STORE_FILE):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Event store not found: {path} (run prepare_data.py first)")
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+    def close(self):
+        self.conn.close()
+
+    def query(self, sql, params=()):
+        """Run an arbitrary read-only SQL query and return all rows."""
+        return self.conn.execute(sql, params).fetchall()
+
+    def _names(self, dim):
+        return dict(self.query(f"SELECT id, name FROM {dim}"))
+
+    def _svi_rows(self, key_col, cond):
+        """(key, svi) for every event with an SVI, in workbook order — sums must be added in this order."""
+        return self.conn.execute(
+            f"SELECT {key_col}, svi FROM events WHERE {cond} AND svi IS NOT NULL ORDER BY rowid"
+        )
+
+    def _fill_grouped(self, acc_map, key_col, names=None, with_monthly=True, where=""):
+        """Fill a keyed accumulator (by_state/by_chapter/...) from GROUP BY queries on one key column."""
+        names = names or {}
+        cond = f"{key_col} IS NOT NULL" + (f" AND {where}" if where else "")
+        for key, label, n in self.query(
+            f"SELECT {key_col}, label, COUNT(*) FROM events "
+            f"WHERE {cond} GROUP BY {key_col}, label ORDER BY {key_col}, label"
+        ):
+            _fill_counts(acc_map[names.get(key, key)], label, n)
+        for key, svi in self._svi_rows(key_col, cond):
+            data = acc_map[names.get(key, key)]
+            data["svi_sum"] += svi
+            data["svi_count"] += 1
+        if not with_monthly:
+            return
+        for key, month, label, n in self.query(
+            f"SELECT {key_col}, month, label, COUNT(*) FROM events "
+            f"WHERE {cond} AND month IS NOT NULL GROUP BY {key_col}, month, label"
+        ):
+            _fill_counts(acc_map[names.get(key, key)]["monthly"][_month_key(month)], label, n)
+
+    def accumulators(self, parts=None):
+        """Rebuild prepare_data accumulators from the store (only the requested parts, if given)."""
+        acc = new_accumulators()
+        wanted = set(parts) if parts else {p for sources in ROLLUP_SOURCES.values() for p in sources}
+
+        if "totals" in wanted:
+            for label, n in self.query("SELECT label, COUNT(*) FROM events GROUP BY label"):
+                _fill_counts(acc["totals"], label, n)
+            for (svi,) in self.conn.execute("SELECT svi FROM events WHERE svi IS NOT NULL ORDER BY rowid"):
+                acc["svi_sum"] += svi
+                acc["svi_count"] += 1
+        if "funnel" in wanted:
+            total, nfirs, notified, care = self.query(
+                "SELECT COUNT(*), TOTAL(nfirs), TOTAL(label IN (0, 1)), TOTAL(label = 0) FROM events"
+            )[0]
+            acc["funnel"].update({
+                "total": total, "nfirs_match": int(nfirs), "rc_notified": int(notified), "rc_care": int(care),
+            })
+        if "monthly" in wanted:
+            for month, label, n in self.query(
+                "SELECT month, label, COUNT(*) FROM events WHERE month IS NOT NULL GROUP BY month, label"
+            ):
+                _fill_counts(acc["monthly"][_month_key(month)], label, n)
+        if "daily" in wanted:
+            for day, label, n in self.query(
+                "SELECT day, label, COUNT(*) FROM events WHERE day IS NOT NULL GROUP BY day, label"
+            ):
+                _fill_counts(acc["daily"][date_cls.fromordinal(day).strftime("%Y-%m-%d")], label, n)
+        if "svi_bins" in wanted:
+            for bin_idx, n, gap in self.query(
+                "SELECT MIN(CAST(svi * 10 AS INTEGER), 9) AS b, COUNT(*), TOTAL(label = 2) FROM events "
+                "WHERE svi IS NOT NULL GROUP BY b"
+            ):
+                acc["svi_bins_total"][bin_idx] += n
+                acc["svi_bins_gap"][bin_idx] += int(gap)
+        if "by_state" in wanted:
+            self._fill_grouped(acc["by_state"], "state_id", self._names("states"))
+        if "by_dept" in wanted:
+            self._fill_grouped(acc["by_dept"], "dept_id", self._names("departments"), with_monthly=False)
+        if "by_county" in wanted:
+            # Seed in first-seen order so ties on total sort the same way as the workbook pass
+            for (fips,) in self.query("SELECT fips FROM counties ORDER BY seq"):
+                acc["by_county"][fips]
+            self._fill_grouped(acc["by_county"], "fips")
+        for part, dim in (("by_chapter", "chapters"), ("by_region", "regions"), ("by_division", "divisions")):
+            if part in wanted:
+                self._fill_grouped(acc[part], f"{dim[:-1]}_id", self._names(dim), where="fips IS NOT NULL")
+        if "county_meta" in wanted:
+            for fips, name, state, chapter, region, division in self.query(
+                "SELECT fips, name, state, chapter, region, division FROM counties ORDER BY seq"
+            ):
+                acc["county_meta"][fips] = {
+                    "name": name, "state": state, "chapter": chapter, "region": region, "division": division,
+                }
+        return acc
+
+    def demographics(self):
+        """County demographics (county_demographics.json shape) for the counties present in the store."""
+        cols = ", ".join(DEMOGRAPHIC_COLUMNS.values())
+        demo = {}
+        for fips, *values in self.query(f"SELECT fips, {cols} FROM counties ORDER BY seq"):
+            entry = {key: v for key, v in zip(DEMOGRAPHIC_COLUMNS, values) if v is not None}
+            if entry:
+                demo[fips] = entry
+        return demo
+
+    def rollups(self, names=None):
+        """Generate dashboard rollups (all, or the given output filenames) from the store."""
+        names = list(names) if names else list(ROLLUP_SOURCES)
+        unknown = [n for n in names if n not in ROLLUP_SOURCES]
+        if unknown:
+            raise ValueError(f"Unknown rollup(s): {', '.join(unknown)}")
+        parts = {p for n in names for p in ROLLUP_SOURCES[n]}
+        outputs = build_rollups(self.accumulators(parts), self.demographics(), names)
+        return {n: outputs[n] for n in names}
+
+
+def main():
+    names = sys.argv[1:]
+    store = EventStore()
+    start = time.perf_counter()
+    outputs = store.rollups(names)
+    elapsed = (time.perf_counter() - start) * 1000
+    store.close()
+    for filename, data in outputs.items():
+        write_json(filename, data)
+    print(f"\nGenerated {len(outputs)} rollups from {os.path.basename(EVENT_STORE_FILE)} in {elapsed:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
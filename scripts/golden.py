@@ -0,0 +1,519 @@
+"""
+FLARE Analytics Golden Outputs
+Determinism + output-equivalence check for pipeline changes. Any speedup to prepare_data.py
+(parallelism, new encodings, a different accumulation order) can silently move a rounding
+boundary or a sort order; this catches it, and times the pipeline while it's at it.
+
+  1. Builds a seeded synthetic fixture: workbook, ZIP CSV, ARC mapping, demographics and
+     station counts (no real data — ties, missing ZIPs/FIPS/demographics and blank labels
+     are all in there on purpose)
+  2. Runs prepare_data.main() on it in a fresh interpreter (paths redirected to a temp dir)
+  3. Canonicalizes every emitted JSON artifact (report bundles included):
+     - object keys sorted
+     - rows ranked by total / opportunityScore have ties ordered by id, so a correct
+       change that breaks ties differently isn't flagged
+     - peers.json and search-index-{kind}.json are keyed by entity instead of list position
+  4. Diffs against the goldens in scripts/golden/ and prints, per artifact and field, how
+     many values differ and the largest difference against that field's tolerance
+
+With --runs N the pipeline runs N times; the raw output bytes must be identical across
+runs (determinism), and the min / median pipeline time is reported next to the time
+recorded with the goldens.
+
+Usage:
+  python scripts/golden.py                      # run once, diff against goldens (exit 1 on failure)
+  python scripts/golden.py --runs 5             # + run-to-run determinism and timing spread
+  python scripts/golden.py --low-memory         # same checks through the spill path
+  python scripts/golden.py --tol careRate=0.1   # loosen one field (repeatable)
+  python scripts/golden.py --events 200000      # bigger fixture, timing only (no golden diff)
+  python scripts/golden.py --update             # rewrite goldens after an intended output change
+"""
+
+import argparse
+import csv
+import datetime
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from search_index import SEARCH_KINDS, search_index_filename
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(SCRIPTS_DIR, "golden")
+MANIFEST_FILE = os.path.join(GOLDEN_DIR, "manifest.json")
+
+FIXTURE_SEED = 2024
+FIXTURE_EVENTS = 3000
+FIXTURE_STATES = {"06": "CA", "12": "FL", "17": "IL", "48": "TX", "72": "PR"}
+FIXTURE_DEPARTMENTS = [f"Station {n} Fire Department" for n in range(1, 31)] + [
+    "Département d'Incendie",
+    "Fire District #2, Inc.",
+    None,
+]
+
+# Absolute tolerance per field (the last key on the value's path). Every other number must
+# match to FLOAT_EPSILON, which only absorbs floating-point summation-order noise.
+FLOAT_EPSILON = 1e-9
+TOLERANCES = {
+    "avgSvi": 0.001,  # mean of 3-dp SVI values; summation order can move the 3rd decimal
+}
+
+# List-of-row fields that are sorted descending; ties are canonicalized by ID_FIELDS
+RANK_FIELDS = ("total", "opportunityScore")
+ID_FIELDS = ("fips", "name", "state", "month", "date", "label")
+
+MAX_EXAMPLES = 3
+
+
+# ---------------------------------------------------------------------------
+# Fixture
+# ---------------------------------------------------------------------------
+
+def make_fixture(fixture_dir, events=FIXTURE_EVENTS, seed=FIXTURE_SEED):
+    """Write the synthetic inputs to fixture_dir and return their paths."""
+    import openpyxl
+
+    rng = random.Random(seed)
+    os.makedirs(fixture_dir, exist_ok=True)
+    paths = {
+        "workbook": os.path.join(fixture_dir, "Match Map.xlsx"),
+        "zip": os.path.join(fixture_dir, "zip_lookup.csv"),
+        "arc": os.path.join(fixture_dir, "arc_mapping.json"),
+        "demographics": os.path.join(fixture_dir, "demographics.json"),
+        "stations": os.path.join(fixture_dir, "fire_station_counts.json"),
+    }
+
+    # 60 counties; the last 4 have no ARC mapping, every 17th has no demographics
+    fips_list = [f"{prefix}{n:03d}" for prefix in FIXTURE_STATES for n in range(1, 24, 2)]
+    arc = []
+    for i, fips in enumerate(fips_list[:-4]):
+        ch = i // 7
+        prefix = "American Red Cross of" if ch % 2 else "The"
+        arc.append({
+            "fips": fips,
+            "county": f"County {fips}",
+            "state": FIXTURE_STATES[fips[:2]],
+            "chapter": f"{prefix} Fixture Chapter {ch}",
+            "region": f"Fixture Region {ch // 2}",
+            "division": f"Fixture Division {ch // 4}",
+        })
+    with open(paths["arc"], "w") as f:
+        json.dump(arc, f)
+
+    demographics = {}
+    for i, fips in enumerate(fips_list):
+        if i % 17 == 5:
+            continue
+        pop = rng.randint(5000, 2000000)
+        demographics[fips] = {
+            "p": pop,
+            "i": rng.randint(30000, 120000) if i % 11 else 0,
+            "hh": pop // rng.randint(2, 4),
+            "pov": rng.randint(pop // 2, pop),
+            "age": round(rng.uniform(28, 50), 1),
+            "hv": rng.randint(80000, 900000),
+        }
+    with open(paths["demographics"], "w") as f:
+        json.dump(demographics, f)
+
+    with open(paths["stations"], "w") as f:
+        json.dump({fips: rng.randint(0, 40) for fips in fips_list[::2]}, f)
+
+    # 3 ZIPs per county, one ZIP with a blank COUNTY_FIPS; "99999" is left out of the CSV
+    zips = []
+    with open(paths["zip"], "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["ZIP_CODE", "COUNTY_FIPS", "County"])
+        for i, fips in enumerate(fips_list):
+            for k in range(3):
+                zip_code = f"{10000 + i * 3 + k:05d}"
+                zips.append(zip_code)
+                writer.writerow([zip_code, fips, f"Zip County {fips}"])
+        writer.writerow(["99990", "", "Unassigned"])
+    zips += ["99990", "99999"]
+
+    labels = ["Fire with RC Care", "Fire with RC Notification", "Fire without RC Notification"]
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["Filter: synthetic golden fixture"])
+    ws.append([])
+    ws.append(["Date", "Address", "NFIRS Address", "RC Respond Address", "RC Care Address", "Department",
+               "Agency Reported", "Calls Received", "SVI Risk", "Master Label", "Latitude", "Longitude"])
+    start = datetime.datetime(2024, 1, 1)
+    for _ in range(events):
+        # Skewed county choice so totals spread out (and still tie at the low end)
+        zip_code = zips[min(int(rng.expovariate(1 / 40)), len(zips) - 1)]
+        r = rng.random()
+        ws.append([
+            start + datetime.timedelta(days=rng.randint(0, 365)) if r > 0.02 else None,
+            f"{rng.randint(1, 999)} Main St, Town, ST {zip_code}" if r < 0.97 else "No ZIP here",
+            f"NFIRS {zip_code}" if rng.random() > 0.3 else None,
+            None,
+            None,
+            rng.choice(FIXTURE_DEPARTMENTS),
+            None,
+            None,
+            round(rng.random(), 4) if rng.random() > 0.05 else None,
+            rng.choice(labels) if rng.random() > 0.03 else None,
+            round(25 + rng.random() * 20, 6) if rng.random() > 0.01 else None,
+            round(-120 + rng.random() * 50, 6),
+        ])
+    wb.save(paths["workbook"])
+    return paths
+
+
+# ---------------------------------------------------------------------------
+# Pipeline run (child process)
+# ---------------------------------------------------------------------------
+
+def _child(fixture_dir, work_dir, low_memory):
+    """Run prepare_data.main() with every input/output path redirected. Prints elapsed seconds last."""
+    sys.path.insert(0, SCRIPTS_DIR)
+    import prepare_data
+
+    out_dir = os.path.join(work_dir, "data")
+    prepare_data.INPUT_FILE = os.path.join(fixture_dir, "Match Map.xlsx")
+    prepare_data.ZIP_LOOKUP_FILE = os.path.join(fixture_dir, "zip_lookup.csv")
+    prepare_data.ARC_MAPPING_FILE = os.path.join(fixture_dir, "arc_mapping.json")
+    prepare_data.DEMOGRAPHICS_FILE = os.path.join(fixture_dir, "demographics.json")
+    prepare_data.OUTPUT_DIR = out_dir
+    prepare_data.EVENT_STORE_FILE = os.path.join(work_dir, "flare_events.db")
+
+    # Imported after the prepare_data paths are patched (they copy them at import time)
+    import lookup_cache
+    import report_bundles
+
+    lookup_cache.SNAPSHOT_FILE = os.path.join(work_dir, "lookup_snapshot.bin")
+    lookup_cache.SOURCES.update(
+        zip=prepare_data.ZIP_LOOKUP_FILE, arc=prepare_data.ARC_MAPPING_FILE, demographics=prepare_data.DEMOGRAPHICS_FILE,
+    )
+    report_bundles.STATION_COUNTS_FILE = os.path.join(fixture_dir, "fire_station_counts.json")
+
+    start = time.perf_counter()
+    prepare_data.main(low_memory=low_memory)
+    print(f"{time.perf_counter() - start:.6f}")
+
+
+def run_pipeline(fixture_dir, work_dir, low_memory=False):
+    """Run the pipeline in a fresh interpreter. Returns (wall seconds, pipeline seconds, output dir)."""
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", fixture_dir, work_dir]
+    if low_memory:
+        cmd.append("--low-memory")
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        print(proc.stdout[-3000:])
+        print(proc.stderr[-3000:], file=sys.stderr)
+        raise SystemExit(f"Pipeline run failed (exit {proc.returncode})")
+    pipeline = float(proc.stdout.strip().splitlines()[-1])
+    return wall, pipeline, os.path.join(work_dir, "data")
+
+
+# ---------------------------------------------------------------------------
+# Canonicalization
+# ---------------------------------------------------------------------------
+
+def _row_id(row):
+    return next((str(row[k]) for k in ID_FIELDS if k in row), "")
+
+
+def _break_ties(rows):
+    """Rows sorted descending by a rank field → same order, ties ordered by id."""
+    if not rows or not all(isinstance(r, dict) for r in rows):
+        return rows
+    for field in RANK_FIELDS:
+        values = [r.get(field) for r in rows]
+        if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values) and all(
+            a >= b for a, b in zip(values, values[1:])
+        ):
+            return sorted(rows, key=lambda r: (-r[field], _row_id(r)))
+    return rows
+
+
+def canonical(value):
+    if isinstance(value, dict):
+        return {k: canonical(value[k]) for k in sorted(value)}
+    if isinstance(value, list):
+        return _break_ties([canonical(v) for v in value])
+    return value
+
+
+def _canonical_peers(data):
+    """peers.json → {layer: {id: [peer ids]}} so list positions don't matter."""
+    out = {"features": data["features"]}
+    for layer in ("counties", "chapters"):
+        ids, k, peers = data[layer]["ids"], data[layer]["k"], data[layer]["peers"]
+        out[layer] = {ids[i]: [ids[j] for j in peers[i * k:(i + 1) * k]] for i in range(len(ids))}
+    return out
+
+
+def _canonical_search_index(data):
+    """search-index-{kind}.json → ranked entries with tie order canonical, postings as sorted labels."""
+    entries = data["entries"]
+    rows = [(entries["total"][i], entries["label"][i], entries["value"][i]) for i in range(len(entries["label"]))]
+    ranked = all(a[0] >= b[0] for a, b in zip(rows, rows[1:]))
+    keys = [label for _, label, _ in rows]
+
+    def postings(table):
+        out = {}
+        for key, deltas in table.items():
+            i, ids = 0, []
+            for d in deltas:
+                i += d
+                ids.append(keys[i])
+            out[key] = sorted(ids)
+        return out
+
+    return {
+        "kind": data["kind"],
+        "ranked": ranked,
+        "entries": sorted(
+            ({"key": k, "total": t, "value": v} for k, (t, _, v) in zip(keys, rows)),
+            key=lambda e: (-e["total"], e["key"]),
+        ),
+        "prefixes": postings(data["prefixes"]),
+        "trigrams": postings(data["trigrams"]),
+    }
+
+
+CANONICALIZERS = {
+    "peers.json": _canonical_peers,
+    **{search_index_filename(kind): _canonical_search_index for kind in SEARCH_KINDS},
+}
+
+
+def load_artifacts(out_dir):
+    """{artifact: canonical data}. Report bundles are grouped into one artifact per level."""
+    artifacts = {}
+    for root, _, files in os.walk(out_dir):
+        for name in sorted(files):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, out_dir).replace(os.sep, "/")
+            with open(path, "r") as f:
+                data = json.load(f)
+            if rel.startswith("reports/"):
+                group = rel.rsplit("/", 1)[0]  # reports/{level}
+                artifacts.setdefault(group, {})[name[:-5]] = canonical(data)
+            else:
+                artifacts[rel] = canonical(CANONICALIZERS.get(rel, lambda d: d)(data))
+    return artifacts
+
+
+def file_hashes(out_dir):
+    hashes = {}
+    for root, _, files in os.walk(out_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                hashes[os.path.relpath(path, out_dir)] = hashlib.sha1(f.read()).hexdigest()
+    return hashes
+
+
+# ---------------------------------------------------------------------------
+# Goldens + diff
+# ---------------------------------------------------------------------------
+
+def _golden_path(artifact):
+    return os.path.join(GOLDEN_DIR, artifact.replace("/", "-") + ("" if artifact.endswith(".json") else ".json"))
+
+
+def write_goldens(artifacts, manifest):
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    for name in os.listdir(GOLDEN_DIR):
+        if name.endswith(".json"):
+            os.remove(os.path.join(GOLDEN_DIR, name))
+    for artifact, data in artifacts.items():
+        with open(_golden_path(artifact), "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True, ensure_ascii=False)
+            f.write("\n")
+    manifest["artifacts"] = sorted(artifacts)
+    with open(MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+def load_goldens():
+    with open(MANIFEST_FILE, "r") as f:
+        manifest = json.load(f)
+    goldens = {}
+    for artifact in manifest["artifacts"]:
+        with open(_golden_path(artifact), "r") as f:
+            goldens[artifact] = json.load(f)
+    return manifest, goldens
+
+
+class Diff:
+    """Walks actual vs golden, collecting per-(artifact, field) numeric stats and structural mismatches."""
+
+    def __init__(self, tolerances):
+        self.tolerances = tolerances
+        self.fields = {}  # (artifact, field) → [compared, differing, max delta, examples]
+        self.structural = {}  # artifact → [messages]
+
+    def _number(self, artifact, field, path, a, b):
+        stats = self.fields.setdefault((artifact, field), [0, 0, 0.0, []])
+        stats[0] += 1
+        delta = abs(a - b)
+        if delta > FLOAT_EPSILON:
+            stats[1] += 1
+            stats[2] = max(stats[2], delta)
+            if delta > self.tolerances.get(field, 0) + FLOAT_EPSILON and len(stats[3]) < MAX_EXAMPLES:
+                stats[3].append(f"{path}: {a!r} (golden {b!r})")
+
+    def _mismatch(self, artifact, path, message):
+        self.structural.setdefault(artifact, []).append(f"{path}: {message}")
+
+    def walk(self, artifact, a, b, path="", field=""):
+        if isinstance(a, bool) or isinstance(b, bool) or a is None or b is None or isinstance(a, str):
+            if a != b:
+                self._mismatch(artifact, path, f"{a!r} (golden {b!r})")
+        elif isinstance(a, (int, float)) and isinstance(b, (int, float)):
+            self._number(artifact, field, path, a, b)
+        elif isinstance(a, dict) and isinstance(b, dict):
+            for key in sorted(a.keys() | b.keys()):
+                if key not in b:
+                    self._mismatch(artifact, f"{path}.{key}", "unexpected key")
+                elif key not in a:
+                    self._mismatch(artifact, f"{path}.{key}", "missing key")
+                else:
+                    self.walk(artifact, a[key], b[key], f"{path}.{key}", key)
+        elif isinstance(a, list) and isinstance(b, list):
+            if len(a) != len(b):
+                self._mismatch(artifact, path, f"length {len(a)} (golden {len(b)})")
+            for i, (x, y) in enumerate(zip(a, b)):
+                self.walk(artifact, x, y, f"{path}[{i}]", field)
+        else:
+            self._mismatch(artifact, path, f"{type(a).__name__} (golden {type(b).__name__})")
+
+    def run(self, actual, golden):
+        for artifact in sorted(actual.keys() | golden.keys()):
+            if artifact not in golden:
+                self._mismatch(artifact, "", "new artifact (not in goldens)")
+            elif artifact not in actual:
+                self._mismatch(artifact, "", "artifact not produced")
+            else:
+                self.walk(artifact, actual[artifact], golden[artifact])
+        return self
+
+    def report(self):
+        """Print the tolerance report. Returns True if everything is within tolerance."""
+        ok = True
+        rows = [(k, v) for k, v in sorted(self.fields.items()) if v[1]]
+        compared = sum(v[0] for v in self.fields.values())
+        print(f"\nNumeric fields: {compared:,} values compared, {len(rows)} artifact fields with differences")
+        for (artifact, field), (n, differing, max_delta, examples) in rows:
+            tol = self.tolerances.get(field, 0)
+            status = "ok" if max_delta <= tol + FLOAT_EPSILON else "FAIL"
+            ok = ok and status == "ok"
+            print(f"  {artifact:<28} {field or '(value)':<20} {differing:>6,}/{n:<7,} max Δ {max_delta:<10.6g} "
+                  f"tol {tol:<8g} {status}")
+            for example in examples:
+                print(f"      {example}")
+        if self.structural:
+            ok = False
+            print(f"\nStructural differences in {len(self.structural)} artifacts:")
+            for artifact, messages in sorted(self.structural.items()):
+                print(f"  {artifact}: {len(messages):,}")
+                for message in messages[:MAX_EXAMPLES]:
+                    print(f"      {message}")
+        return ok
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def _parse_tolerances(items):
+    tolerances = dict(TOLERANCES)
+    for item in items:
+        field, _, value = item.partition("=")
+        tolerances[field] = float(value)
+    return tolerances
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        _child(sys.argv[2], sys.argv[3], "--low-memory" in sys.argv[4:])
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=1, help="pipeline runs (default: 1)")
+    parser.add_argument("--events", type=int, default=FIXTURE_EVENTS, help=f"fixture events (default: {FIXTURE_EVENTS})")
+    parser.add_argument("--seed", type=int, default=FIXTURE_SEED, help=f"fixture seed (default: {FIXTURE_SEED})")
+    parser.add_argument("--low-memory", action="store_true", help="run the pipeline with --low-memory")
+    parser.add_argument("--tol", action="append", default=[], metavar="FIELD=VALUE", help="override a field tolerance")
+    parser.add_argument("--update", action="store_true", help="rewrite the goldens from this run")
+    args = parser.parse_args()
+
+    golden_fixture = args.events == FIXTURE_EVENTS and args.seed == FIXTURE_SEED
+    if args.update and not golden_fixture:
+        parser.error("--update only works with the default fixture (--events/--seed unchanged)")
+
+    with tempfile.TemporaryDirectory(prefix="flare-golden-") as tmp:
+        start = time.perf_counter()
+        fixture_dir = os.path.join(tmp, "fixture")
+        make_fixture(fixture_dir, args.events, args.seed)
+        print(f"Fixture: {args.events:,} events, seed {args.seed} ({time.perf_counter() - start:.1f}s)")
+
+        timings = []
+        hashes = []
+        out_dirs = []
+        for i in range(args.runs):
+            wall, pipeline, out_dir = run_pipeline(fixture_dir, os.path.join(tmp, f"run{i}"), args.low_memory)
+            timings.append(pipeline)
+            hashes.append(file_hashes(out_dir))
+            out_dirs.append(out_dir)
+            print(f"  Run {i + 1}: pipeline {pipeline:.2f}s (wall {wall:.2f}s incl. interpreter startup)")
+
+        deterministic = True
+        for i, h in enumerate(hashes[1:], start=2):
+            changed = sorted(name for name in h.keys() | hashes[0].keys() if h.get(name) != hashes[0].get(name))
+            if changed:
+                deterministic = False
+                print(f"  NOT DETERMINISTIC: run {i} differs from run 1 in {len(changed)} files: {', '.join(changed[:5])}")
+        if args.runs > 1 and deterministic:
+            print(f"  Deterministic: {len(hashes[0])} files byte-identical across {args.runs} runs")
+
+        best, median = min(timings), statistics.median(timings)
+        actual = load_artifacts(out_dirs[0])
+
+        if args.update:
+            write_goldens(actual, {
+                "seed": args.seed,
+                "events": args.events,
+                "pipeline_seconds": round(best, 3),
+                "python": platform.python_version(),
+            })
+            print(f"\nWrote {len(actual)} goldens to {GOLDEN_DIR}/")
+            return
+
+    recorded = None
+    ok = deterministic
+    if golden_fixture:
+        manifest, goldens = load_goldens()
+        recorded = manifest.get("pipeline_seconds")
+        ok = Diff(_parse_tolerances(args.tol)).run(actual, goldens).report() and ok
+    else:
+        print("\nCustom fixture — golden diff skipped (timing only)")
+
+    timing = f"\nPipeline time: min {best:.2f}s, median {median:.2f}s over {args.runs} run(s)"
+    if recorded:
+        timing += f" — goldens recorded {recorded:.2f}s ({(best - recorded) / recorded:+.0%})"
+    print(timing)
+    print("PASS" if ok else "FAIL")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+FLARE Analytics Lookup Snapshot
+Compiles the three pipeline lookups into one binary, memory-mappable file so scripts don't
+re-parse the ZIP CSV / ARC mapping JSON / demographics JSON on every run:
+  - zip:          ZIP → {"county_fips", "county"}            (zip_to_redcross_comprehensive.csv)
+  - arc:          FIPS → {"county", "state", "chapter", ...}  (arc_county_chapter_mapping.json)
+  - demographics: FIPS → {"p", "i", "hh", "pov", "age", "hv"} (county_demographics.json)
+
+The snapshot is rebuilt only when a source file changes (size/mtime first, then SHA-1, so a
+touched-but-identical file doesn't force a rebuild — its new mtime is written back to the
+header, so later runs are back to a stat-only check). Readers mmap the file and binary-search
+a sorted uint32 key array; values are decoded lazily on first access, so opening the
+snapshot costs next to nothing no matter how many scripts share it.
+
+Lookups match the exact key string, as the source dicts do: only keys of exactly five ASCII
+digits go in the uint32 array (so "1001" or "001001" never finds "01001"), and any other key
+is kept verbatim in a small per-table JSON side table.
+
+File layout (little-endian):
+  MAGIC | uint32 header length | JSON header (sources, tables) | padding to 8 bytes | body
+  per table in body: uint32 keys[n] (sorted) | uint32 offsets[n + 1] | compact-JSON value blob
+                     | compact-JSON {key: value} side table (header "extra" = its byte length)
+
+Usage:
+  python scripts/lookup_cache.py           # build if stale, print table sizes
+  python scripts/lookup_cache.py --force   # rebuild unconditionally
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+from collections.abc import Mapping
+
+from prepare_data import (
+    ARC_MAPPING_FILE, DEMOGRAPHICS_FILE, SCRIPTS_DIR, ZIP_LOOKUP_FILE,
+    load_arc_mapping, load_demographics, load_zip_lookup,
+)
+
+SNAPSHOT_FILE = os.path.join(SCRIPTS_DIR, "lookup_snapshot.bin")
+MAGIC = b"FLRLKP2\n"
+
+SOURCES = {
+    "zip": ZIP_LOOKUP_FILE,
+    "arc": ARC_MAPPING_FILE,
+    "demographics": DEMOGRAPHICS_FILE,
+}
+
+Lookups = namedtuple("Lookups", ["zip", "arc", "demographics"])
+
+
+def _sha1(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _source_stamp(path, with_hash=True):
+    st = os.stat(path)
+    stamp = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if with_hash:
+        stamp["sha1"] = _sha1(path)
+    return stamp
+
+
+def _is_packed_key(key):
+    """True for keys stored in the uint32 array: exactly five ASCII digits."""
+    return isinstance(key, str) and len(key) == 5 and key.isascii() and key.isdigit()
+
+
+def _pack_table(mapping):
+    """Encode a str-keyed dict as sorted 5-digit keys + offsets + value blob + side table.
+
+    Returns (packed key count, side table byte length, encoded bytes).
+    """
+    items = []
+    extra = {}
+    for k, v in mapping.items():
+        if _is_packed_key(k):
+            items.append((int(k), v))
+        else:
+            extra[k] = v
+    items.sort(key=lambda item: item[0])
+    keys = array("I", (k for k, _ in items))
+    offsets = array("I", [0])
+    blob = bytearray()
+    for _, value in items:
+        blob += json.dumps(value, separators=(",", ":")).encode("utf-8")
+        offsets.append(len(blob))
+    extra_bytes = json.dumps(extra, separators=(",", ":")).encode("utf-8") if extra else b""
+    return len(items), len(extra_bytes), keys.tobytes() + offsets.tobytes() + bytes(blob) + extra_bytes
+
+
+def build_snapshot(path=SNAPSHOT_FILE):
+    """Parse the source lookups and write a fresh snapshot (atomically replaced)."""
+    tables = {
+        "zip": load_zip_lookup(),
+        "arc": load_arc_mapping(),
+        "demographics": load_demographics(),
+    }
+    header = {"sources": {name: _source_stamp(src) for name, src in SOURCES.items()}, "tables": {}}
+    body = bytearray()
+    for name, mapping in tables.items():
+        count, extra, packed = _pack_table(mapping)
+        header["tables"][name] = {"count": count, "offset": len(body), "extra": extra}
+        body += packed
+        body += b"\0" * (-len(body) % 8)
+
+    _write_snapshot(path, header, body)
+    return path
+
+
+def _write_snapshot(path, header, body):
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    prefix = MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes
+    prefix += b"\0" * (-len(prefix) % 8)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(prefix)
+        f.write(body)
+    os.replace(tmp_path, path)
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return None
+        (length,) = struct.unpack("<I", f.read(4))
+        return json.loads(f.read(length))
+
+
+def _restamp(path, header):
+    """Rewrite the snapshot header (source stamps) around the unchanged body."""
+    with open(path, "rb") as f:
+        f.seek(len(MAGIC))
+        (length,) = struct.unpack("<I", f.read(4))
+        header_end = len(MAGIC) + 4 + length
+        f.seek(header_end + (-header_end % 8))
+        body = f.read()
+    _write_snapshot(path, header, body)
+
+
+def is_fresh(path=SNAPSHOT_FILE):
+    """True if the snapshot exists and was built from the current source files.
+
+    Sources whose mtime moved but whose SHA-1 still matches get their stored stamp updated.
+    """
+    if not os.path.exists(path):
+        return False
+    header = _read_header(path)
+    if not header:
+        return False
+    touched = False
+    for name, src in SOURCES.items():
+        stored = header["sources"].get(name)
+        if not stored:
+            return False
+        current = _source_stamp(src, with_hash=False)
+        if current["size"] == stored["size"] and current["mtime_ns"] == stored["mtime_ns"]:
+            continue
+        if current["size"] != stored["size"] or _sha1(src) != stored["sha1"]:
+            return False
+        stored["mtime_ns"] = current["mtime_ns"]
+        touched = True
+    if touched:
+        _restamp(path, header)
+    return True
+
+
+class LookupTable(Mapping):
+    """Read-only mapping over one snapshot table, keyed by the exact ZIP/FIPS strings."""
+
+    def __init__(self, buf, offset, count, extra=0):
+        self._count = count
+        key_bytes = 4 * count
+        self._keys = buf[offset:offset + key_bytes].cast("I")
+        self._offsets = buf[offset + key_bytes:offset + 2 * key_bytes + 4].cast("I")
+        blob_start = offset + 2 * key_bytes + 4
+        blob_end = blob_start + self._offsets[count]
+        self._blob = buf[blob_start:blob_end]
+        self._extra = json.loads(bytes(buf[blob_end:blob_end + extra])) if extra else {}
+        self._decoded = {}
+
+    def _index(self, key):
+        if not _is_packed_key(key):
+            return -1
+        k = int(key)
+        i = bisect_left(self._keys, k)
+        return i if i < self._count and self._keys[i] == k else -1
+
+    def __getitem__(self, key):
+        i = self._index(key)
+        if i < 0:
+            if isinstance(key, str) and key in self._extra:
+                return self._extra[key]
+            raise KeyError(key)
+        value = self._decoded.get(i)
+        if value is None:
+            value = json.loads(bytes(self._blob[self._offsets[i]:self._offsets[i + 1]]))
+            self._decoded[i] = value
+        return value
+
+    def __contains__(self, key):
+        return self._index(key) >= 0 or (isinstance(key, str) and key in self._extra)
+
+    def __iter__(self):
+        yield from (f"{k:05d}" for k in self._keys)
+        yield from self._extra
+
+    def __len__(self):
+        return self._count + len(self._extra)
+
+
+def open_snapshot(path=SNAPSHOT_FILE):
+    """Memory-map an existing snapshot and return its Lookups tables."""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buf = memoryview(mm)
+    (length,) = struct.unpack_from("<I", buf, len(MAGIC))
+    header_end = len(MAGIC) + 4 + length
+    header = json.loads(bytes(buf[len(MAGIC) + 4:header_end]))
+    base = header_end + (-header_end % 8)
+    tables = header["tables"]
+    return Lookups(*(
+        LookupTable(buf, base + tables[name]["offset"], tables[name]["count"], tables[name]["extra"])
+        for name in Lookups._fields
+    ))
+
+
+def load_lookups(path=None, rebuild=False):
+    """Return (zip, arc, demographics) lookups, rebuilding the snapshot first if it's stale."""
+    path = path or SNAPSHOT_FILE
+    if rebuild or not is_fresh(path):
+        print(f"  Building lookup snapshot {os.path.basename(path)}...")
+        build_snapshot(path)
+    return open_snapshot(path)
+
+
+def main():
+    lookups = load_lookups(rebuild="--force" in sys.argv[1:])
+    print(f"Lookup snapshot {SNAPSHOT_FILE} ({os.path.getsize(SNAPSHOT_FILE):,} bytes)")
+    for name, table in zip(Lookups._fields, lookups):
+        print(f"  {name}: {len(table):,} keys")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+FLARE Analytics Peer Index
+Precomputes, for every county and chapter, its k nearest peers in a normalized feature space
+so entity reports can show comparable entities without scanning every county at request time.
+
+Features (see PEER_FEATURES): population (log-scaled, it spans 5 orders of magnitude),
+poverty rate, median income, average SVI and fires per 10k. Each is z-scored across the
+entities of that level. Neighbors come from a k-d tree (pure Python, no numpy) rather than
+all-pairs distance loops. Entities without demographics (population 0) are left out.
+
+Output shape (peers.json):
+  {"features": [...],
+   "counties": {"k": 5, "ids": ["17031", ...], "peers": [i0, i1, ...]},   # flat, k per entity
+   "chapters": {"k": 5, "ids": ["ARC of Greater Chicago", ...], "peers": [...]}}
+peers[i * k:(i + 1) * k] are indexes into ids for ids[i], nearest first.
+Only report_bundles.py reads it; the browser fallback in lib/report-data.ts (no bundle)
+still picks peers by similar fire volume.
+"""
+
+import heapq
+import math
+
+PEER_K = 5
+PEER_FEATURES = ("population", "povertyRate", "medianIncome", "avgSvi", "firesPer10k")
+
+
+class KDTree:
+    """Static k-d tree over equal-length numeric vectors."""
+
+    def __init__(self, points):
+        self.points = points
+        self.dims = len(points[0]) if points else 0
+        self.root = self._build(list(range(len(points))), 0)
+
+    def _build(self, idx, depth):
+        if not idx:
+            return None
+        axis = depth % self.dims
+        idx.sort(key=lambda i: self.points[i][axis])
+        mid = len(idx) // 2
+        return (idx[mid], axis, self._build(idx[:mid], depth + 1), self._build(idx[mid + 1:], depth + 1))
+
+    def nearest(self, target, k, exclude=None):
+        """Indexes of the k points nearest to target (Euclidean), nearest first."""
+        heap = []  # max-heap of (-dist2, -index) so ties resolve to the lower index
+
+        def visit(node):
+            if node is None:
+                return
+            i, axis, left, right = node
+            if i != exclude:
+                d2 = sum((a - b) ** 2 for a, b in zip(self.points[i], target))
+                item = (-d2, -i)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            diff = target[axis] - self.points[i][axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(heap) < k or diff * diff <= -heap[0][0]:
+                visit(far)
+
+        visit(self.root)
+        return [-i for _, i in sorted(heap, reverse=True)]
+
+
+def _normalize(rows):
+    """Log-scale population, then z-score every feature column."""
+    vectors = [[math.log10(r["population"])] + [float(r[f]) for f in PEER_FEATURES[1:]] for r in rows]
+    n = len(vectors)
+    for d in range(len(PEER_FEATURES)):
+        col = [v[d] for v in vectors]
+        mean = sum(col) / n
+        std = math.sqrt(sum((x - mean) ** 2 for x in col) / n) or 1.0
+        for v in vectors:
+            v[d] = (v[d] - mean) / std
+    return vectors
+
+
+def _peer_layer(rows, id_key, k):
+    rows = [r for r in rows if r["population"] > 0]
+    if len(rows) <= 1:
+        return {"k": 0, "ids": [r[id_key] for r in rows], "peers": []}
+    vectors = _normalize(rows)
+    tree = KDTree(vectors)
+    k = min(k, len(rows) - 1)
+    peers = []
+    for i, v in enumerate(vectors):
+        peers.extend(tree.nearest(v, k, exclude=i))
+    return {"k": k, "ids": [r[id_key] for r in rows], "peers": peers}
+
+
+def build_peer_index(county_out, chapter_out, k=PEER_K):
+    """Build peers.json from the by-county / by-chapter rollup rows."""
+    counties = []
+    chapter_sums = {}
+    for c in county_out:
+        pop = c["population"]
+        counties.append({
+            "fips": c["fips"],
+            "population": pop,
+            "povertyRate": c["poverty"] / pop * 100 if pop > 0 else 0,
+            "medianIncome": c["medianIncome"],
+            "avgSvi": c["avgSvi"],
+            "firesPer10k": c["firesPer10k"],
+        })
+        # Chapter poverty/income roll up the same way lib/aggregator.ts does
+        # (poverty summed over population, income weighted by fire count)
+        s = chapter_sums.setdefault(c["chapter"], {"poverty": 0, "income_sum": 0, "income_weight": 0})
+        s["poverty"] += c["poverty"]
+        if c["medianIncome"] > 0:
+            s["income_sum"] += c["medianIncome"] * c["total"]
+            s["income_weight"] += c["total"]
+
+    chapters = []
+    for ch in chapter_out:
+        s = chapter_sums.get(ch["name"], {"poverty": 0, "income_sum": 0, "income_weight": 0})
+        pop = ch["population"]
+        chapters.append({
+            "name": ch["name"],
+            "population": pop,
+            "povertyRate": s["poverty"] / pop * 100 if pop > 0 else 0,
+            "medianIncome": s["income_sum"] / s["income_weight"] if s["income_weight"] else 0,
+            "avgSvi": ch["avgSvi"],
+            "firesPer10k": ch["firesPer10k"],
+        })
+
+    return {
+        "features": list(PEER_FEATURES),
+        "counties": _peer_layer(counties, "fips", k),
+        "chapters": _peer_layer(chapters, "name", k),
+    }
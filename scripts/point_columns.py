@@ -0,0 +1,144 @@
+"""
+FLARE Analytics point columns
+Column store for the per-event map points written to fires-points.json. Values live in
+typed arrays (not Python lists); in low-memory mode each column is spilled to a binary file
+on disk every `chunk_size` points, and the JSON is streamed back out chunk by chunk, so peak
+memory stays flat no matter how many events the workbook holds.
+
+The JSON written is byte-identical to json.dump(..., separators=(",", ":")) of the old
+flat lists: lat/lon rounded to 4 places, svi to 3 (0 when missing), fips as given (normally
+5 digits, but any string round-trips — stored as a UTF-8 blob plus a per-point length column).
+"""
+
+import json
+import math
+import os
+import shutil
+import tempfile
+from array import array
+
+# column name → (array typecode, JSON formatter)
+COLUMNS = {
+    "lat": ("d", repr),
+    "lon": ("d", repr),
+    "cat": ("b", str),
+    "svi": ("d", lambda v: "0" if math.isnan(v) else repr(v)),
+    "month": ("b", str),
+    "ch": ("i", str),
+    "rg": ("i", str),
+}
+
+
+def _split(lengths, blob):
+    """UTF-8 blob + per-string byte lengths → list of strings."""
+    out = []
+    pos = 0
+    for n in lengths:
+        out.append(blob[pos:pos + n].decode("utf-8"))
+        pos += n
+    return out
+
+
+class PointColumns:
+    """Append-only per-point columns. spill=True writes them to binary files under spill_dir (default: system temp)."""
+
+    def __init__(self, spill=False, spill_dir=None, chunk_size=100000):
+        self.spill = spill
+        self.chunk_size = chunk_size
+        self.count = 0
+        self.columns = {name: array(code) for name, (code, _) in COLUMNS.items()}
+        self.fips_len = array("I")
+        self.fips = bytearray()
+        self.files = {}
+        if spill:
+            self.tmp_dir = tempfile.mkdtemp(prefix="flare-points-", dir=spill_dir)
+            for name in list(COLUMNS) + ["fips_len", "fips"]:
+                self.files[name] = open(os.path.join(self.tmp_dir, f"{name}.bin"), "w+b")
+
+    def __len__(self):
+        return self.count
+
+    def append(self, lat, lon, cat, svi, month, ch, rg, fips):
+        cols = self.columns
+        cols["lat"].append(round(lat, 4))
+        cols["lon"].append(round(lon, 4))
+        cols["cat"].append(cat)
+        cols["svi"].append(round(svi, 3) if svi is not None else math.nan)
+        cols["month"].append(month)
+        cols["ch"].append(ch)
+        cols["rg"].append(rg)
+        encoded = fips.encode("utf-8")
+        self.fips_len.append(len(encoded))
+        self.fips += encoded
+        self.count += 1
+        if self.files and len(cols["lat"]) >= self.chunk_size:
+            self._spill()
+
+    def _spill(self):
+        for name, col in self.columns.items():
+            col.tofile(self.files[name])
+            self.columns[name] = array(col.typecode)
+        self.fips_len.tofile(self.files["fips_len"])
+        self.fips_len = array("I")
+        self.files["fips"].write(self.fips)
+        self.fips = bytearray()
+
+    def _chunks(self, name):
+        """Yield the column's values chunk by chunk (from disk when spilled)."""
+        if not self.files:
+            yield self.columns[name]
+            return
+        f = self.files[name]
+        f.seek(0)
+        typecode = COLUMNS[name][0] if name in COLUMNS else "I"
+        remaining = self.count
+        while remaining:
+            chunk = array(typecode)
+            n = min(self.chunk_size, remaining)
+            chunk.fromfile(f, n)
+            remaining -= n
+            yield chunk
+
+    def _fips_chunks(self):
+        """Yield lists of FIPS strings chunk by chunk (from disk when spilled)."""
+        if not self.files:
+            yield _split(self.fips_len, self.fips)
+            return
+        blob_file = self.files["fips"]
+        blob_file.seek(0)
+        for lengths in self._chunks("fips_len"):
+            yield _split(lengths, blob_file.read(sum(lengths)))
+
+    def _write_column(self, out, name):
+        out.write(f'"{name}":[')
+        first = True
+        chunks = self._fips_chunks() if name == "fips" else self._chunks(name)
+        for chunk in chunks:
+            values = map(json.dumps, chunk) if name == "fips" else map(COLUMNS[name][1], chunk)
+            text = ",".join(values)
+            if text:
+                out.write(text if first else "," + text)
+                first = False
+        out.write("],")
+
+    def write_json(self, path, chapters, regions):
+        """Stream fires-points.json (flat arrays + chapter/region name lists) to `path`."""
+        if self.files:
+            self._spill()
+            for f in self.files.values():
+                f.flush()
+        with open(path, "w") as out:
+            out.write("{")
+            for name in list(COLUMNS) + ["fips"]:
+                self._write_column(out, name)
+            out.write('"chapters":' + json.dumps(chapters, separators=(",", ":")) + ",")
+            out.write('"regions":' + json.dumps(regions, separators=(",", ":")) + ",")
+            out.write(f'"count":{self.count}}}')
+
+    def close(self):
+        """Remove spill files (no-op for in-memory columns)."""
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+        if self.spill:
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
@@ -15,19 +15,24 @@ feature service in the future, make sure PR municipio entries are preserved —
 only returns the 72998 rollup, not individual municipios.
 """
 
-import openpyxl
 import json
 import os
+import sys
 import csv
 from collections import defaultdict
 from datetime import datetime
 
+from peer_index import build_peer_index
+from search_index import SEARCH_KINDS, build_search_indexes, search_index_filename
+
 INPUT_FILE = os.path.expanduser("~/Desktop/FlareData/Match Map.xlsx")
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "public", "data")
+GEO_DIR = os.path.join(OUTPUT_DIR, "geo")
 SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
 ZIP_LOOKUP_FILE = os.path.join(SCRIPTS_DIR, "zip_to_redcross_comprehensive.csv")
 DEMOGRAPHICS_FILE = os.path.join(SCRIPTS_DIR, "county_demographics.json")
 ARC_MAPPING_FILE = os.path.join(SCRIPTS_DIR, "arc_county_chapter_mapping.json")
+EVENT_STORE_FILE = os.path.join(SCRIPTS_DIR, "flare_events.db")
 
 # Master Label mapping to short keys
 LABEL_MAP = {
@@ -36,6 +41,12 @@ LABEL_MAP = {
     "Fire without RC Notification": "gap",
 }
 
+# Choropleth metrics joined into geo-metrics.json (per-feature arrays in TopoJSON geometry order)
+GEO_METRICS = ("total", "gapRate", "careRate", "firesPer10k", "avgSvi")
+
+# Short key → category index (compact encoding in fires-points.json and the event store)
+CATEGORY_INDEX = {"care": 0, "notification": 1, "gap": 2}
+
 
 def parse_date(val):
     """Parse date from Excel datetime or string."""
@@ -206,110 +217,117 @@ def extract_zip(row, col_map):
     return None
 
 
-def main():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-    # Load lookups
-    print("Loading ZIP → county FIPS lookup...")
-    zip_lookup = load_zip_lookup()
-    print(f"  Loaded {len(zip_lookup):,} ZIP codes")
-
-    print("Loading ARC Master Geography (FIPS → Chapter/Region/Division)...")
-    arc_mapping = load_arc_mapping()
-    print(f"  Loaded {len(arc_mapping):,} counties → {len(set(m['chapter'] for m in arc_mapping.values()))} chapters")
-
-    print("Loading county demographics...")
-    demographics = load_demographics()
-    print(f"  Loaded {len(demographics):,} counties")
-
-    print(f"Loading {INPUT_FILE}...")
-    wb = openpyxl.load_workbook(INPUT_FILE, read_only=True, data_only=True)
-    ws = wb.active
-
-    rows = ws.iter_rows(values_only=True)
+def _counts():
+    return {"care": 0, "notification": 0, "gap": 0, "total": 0}
 
-    # Skip metadata rows (row 1 = filter text, row 2 = blank)
-    next(rows)  # row 1 metadata
-    next(rows)  # row 2 blank
-
-    # Row 3 = actual headers
-    header = next(rows)
-    print(f"Columns: {[str(h) for h in header]}")
 
-    # Column indices
-    COL = {
-        "date": 0,
-        "address": 1,
-        "nfirs_addr": 2,
-        "rc_respond_addr": 3,
-        "rc_care_addr": 4,
-        "department": 5,
-        "agency_reported": 6,
-        "calls_received": 7,
-        "svi_risk": 8,
-        "master_label": 9,
-        "lat": 10,
-        "lon": 11,
-    }
-
-    # Accumulators
-    points_lat = []
-    points_lon = []
-    points_cat = []  # 0=care, 1=notification, 2=gap
-    points_svi = []
-    points_month = []
-    points_chapter = []  # index into chapter_list for map hover
-    points_region = []   # index into region_list for map hover
-    points_fips = []     # county FIPS (5-digit string, "" if unknown)
-
-    # Lookup lists for compact point encoding (index → name)
-    chapter_list = []
-    chapter_idx_map = {}
-    region_list = []
-    region_idx_map = {}
-
-    totals = {"care": 0, "notification": 0, "gap": 0, "total": 0}
-    svi_sum = 0.0
-    svi_count = 0
-    zip_match_count = 0
-
-    monthly = defaultdict(lambda: {"care": 0, "notification": 0, "gap": 0, "total": 0})
-    daily = defaultdict(lambda: {"care": 0, "notification": 0, "gap": 0, "total": 0})
-    by_state = defaultdict(lambda: {
+def _dept_acc():
+    return {
         "care": 0, "notification": 0, "gap": 0, "total": 0,
         "svi_sum": 0.0, "svi_count": 0,
-        "monthly": defaultdict(lambda: {"care": 0, "notification": 0, "gap": 0, "total": 0}),
-    })
-    by_dept = defaultdict(lambda: {
+    }
+
+
+def _org_acc():
+    return {
         "care": 0, "notification": 0, "gap": 0, "total": 0,
         "svi_sum": 0.0, "svi_count": 0,
-    })
+        "monthly": defaultdict(_counts),
+    }
 
-    # New org hierarchy accumulators
-    def _org_acc():
-        return {
-            "care": 0, "notification": 0, "gap": 0, "total": 0,
-            "svi_sum": 0.0, "svi_count": 0,
-            "monthly": defaultdict(lambda: {"care": 0, "notification": 0, "gap": 0, "total": 0}),
-        }
 
-    by_county = defaultdict(_org_acc)     # keyed by county_fips
-    by_chapter = defaultdict(_org_acc)    # keyed by chapter name
-    by_region = defaultdict(_org_acc)     # keyed by region name
-    by_division = defaultdict(_org_acc)   # keyed by division name
+def new_accumulators():
+    """Empty rollup accumulators. Filled by the workbook pass (or rebuilt from the event store)."""
+    return {
+        "totals": _counts(),
+        "svi_sum": 0.0,
+        "svi_count": 0,
+        "monthly": defaultdict(_counts),
+        "daily": defaultdict(_counts),
+        "by_state": defaultdict(_org_acc),
+        "by_dept": defaultdict(_dept_acc),
+        "by_county": defaultdict(_org_acc),     # keyed by county_fips
+        "by_chapter": defaultdict(_org_acc),    # keyed by chapter name
+        "by_region": defaultdict(_org_acc),     # keyed by region name
+        "by_division": defaultdict(_org_acc),   # keyed by division name
+        # Track county metadata (fips → {name, state, chapter, region, division})
+        "county_meta": {},
+        # SVI histogram bins (0.0-0.1, 0.1-0.2, ..., 0.9-1.0)
+        "svi_bins_total": [0] * 10,
+        "svi_bins_gap": [0] * 10,
+        # Funnel stages
+        "funnel": {"total": 0, "nfirs_match": 0, "rc_notified": 0, "rc_care": 0},
+    }
 
-    # Track county metadata (fips → {name, state, chapter, region, division})
-    county_meta = {}
 
-    # SVI histogram bins (0.0-0.1, 0.1-0.2, ..., 0.9-1.0)
-    svi_bins_total = [0] * 10
-    svi_bins_gap = [0] * 10
+# Workbook column indices (row 3 holds the headers)
+COL = {
+    "date": 0,
+    "address": 1,
+    "nfirs_addr": 2,
+    "rc_respond_addr": 3,
+    "rc_care_addr": 4,
+    "department": 5,
+    "agency_reported": 6,
+    "calls_received": 7,
+    "svi_risk": 8,
+    "master_label": 9,
+    "lat": 10,
+    "lon": 11,
+}
 
-    # Funnel stages
-    funnel = {"total": 0, "nfirs_match": 0, "rc_notified": 0, "rc_care": 0}
 
-    skipped = 0
-    processed = 0
+class Ingest:
+    """Running state of the workbook pass: accumulators, map points, event rows and counters.
+
+    main() fills one in a single pass; watch.py keeps one warm and feeds it only appended rows.
+    """
+
+    def __init__(self, points, store):
+        self.accumulators = new_accumulators()
+        # Map points: lat, lon, cat (0=care, 1=notification, 2=gap), svi, month,
+        # chapter/region index (into chapter_list/region_list for map hover), county FIPS ("" if unknown)
+        self.points = points
+        self.store = store
+        # Lookup lists for compact point encoding (index → name)
+        self.chapter_list = []
+        self.chapter_idx_map = {}
+        self.region_list = []
+        self.region_idx_map = {}
+        self.processed = 0
+        self.skipped = 0
+        self.zip_match_count = 0
+
+
+def ingest_rows(rows, zip_lookup, arc_mapping, ingest):
+    """Enrich workbook data rows (ZIP → FIPS → ARC hierarchy) and accumulate them into `ingest`."""
+    accumulators = ingest.accumulators
+    points = ingest.points
+    store = ingest.store
+    chapter_list = ingest.chapter_list
+    chapter_idx_map = ingest.chapter_idx_map
+    region_list = ingest.region_list
+    region_idx_map = ingest.region_idx_map
+
+    totals = accumulators["totals"]
+    monthly = accumulators["monthly"]
+    daily = accumulators["daily"]
+    by_state = accumulators["by_state"]
+    by_dept = accumulators["by_dept"]
+    by_county = accumulators["by_county"]
+    by_chapter = accumulators["by_chapter"]
+    by_region = accumulators["by_region"]
+    by_division = accumulators["by_division"]
+    county_meta = accumulators["county_meta"]
+    svi_bins_total = accumulators["svi_bins_total"]
+    svi_bins_gap = accumulators["svi_bins_gap"]
+    funnel = accumulators["funnel"]
+
+    svi_sum = accumulators["svi_sum"]
+    svi_count = accumulators["svi_count"]
+    zip_match_count = ingest.zip_match_count
+    skipped = ingest.skipped
+    processed = ingest.processed
 
     print("Processing rows...")
     for row in rows:
@@ -411,17 +429,14 @@ def main():
             rg_idx = region_idx_map[region_name]
 
         # Category index for compact storage
-        cat_idx = {"care": 0, "notification": 1, "gap": 2}[label]
+        cat_idx = CATEGORY_INDEX[label]
 
         # Points for deck.gl (flat arrays for minimal JSON size)
-        points_lat.append(round(lat, 4))
-        points_lon.append(round(lon, 4))
-        points_cat.append(cat_idx)
-        points_svi.append(round(svi, 3) if svi is not None else 0)
-        points_month.append(date.month if date else 0)
-        points_chapter.append(ch_idx)
-        points_region.append(rg_idx)
-        points_fips.append(county_fips)
+        points.append(lat, lon, cat_idx, svi, date.month if date else 0, ch_idx, rg_idx, county_fips)
+
+        # Enriched event row for the queryable store
+        store.add(date, county_fips, state, chapter_name, region_name, division_name,
+                  cat_idx, svi, lat, lon, dept, bool(row[COL["nfirs_addr"]]))
 
         # Totals
         totals[label] += 1
@@ -480,29 +495,120 @@ def main():
         if processed % 20000 == 0:
             print(f"  Processed {processed:,} rows...")
 
+    accumulators["svi_sum"] = svi_sum
+    accumulators["svi_count"] = svi_count
+    ingest.zip_match_count = zip_match_count
+    ingest.skipped = skipped
+    ingest.processed = processed
+
+
+def main(low_memory=False):
+    """Run the full pipeline. low_memory spills map point columns to disk while reading."""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    # Imported here so the rollup helpers can be reused without openpyxl installed
+    import openpyxl
+    from event_store import EventStoreWriter
+    from lookup_cache import load_lookups
+    from point_columns import PointColumns
+
+    # Load lookups (compiled snapshot, rebuilt only when a source file changes)
+    print("Loading lookups (ZIP → FIPS, ARC Master Geography, demographics)...")
+    zip_lookup, arc_mapping, demographics = load_lookups()
+    print(f"  Loaded {len(zip_lookup):,} ZIP codes")
+    print(f"  Loaded {len(arc_mapping):,} counties → {len(set(m['chapter'] for m in arc_mapping.values()))} chapters")
+    print(f"  Loaded {len(demographics):,} counties with demographics")
+
+    print(f"Loading {INPUT_FILE}...")
+    wb = openpyxl.load_workbook(INPUT_FILE, read_only=True, data_only=True)
+    ws = wb.active
+
+    rows = ws.iter_rows(values_only=True)
+
+    # Skip metadata rows (row 1 = filter text, row 2 = blank)
+    next(rows)  # row 1 metadata
+    next(rows)  # row 2 blank
+
+    # Row 3 = actual headers
+    header = next(rows)
+    print(f"Columns: {[str(h) for h in header]}")
+
+    ingest = Ingest(PointColumns(spill=low_memory), EventStoreWriter(EVENT_STORE_FILE))
+
+    ingest_rows(rows, zip_lookup, arc_mapping, ingest)
+
     wb.close()
-    print(f"\nProcessed: {processed:,} | Skipped: {skipped}")
-    print(f"Totals: {totals}")
-    print(f"ZIP matches: {zip_match_count:,} ({zip_match_count/processed*100:.1f}%)")
-    print(f"Counties: {len(by_county)} | Chapters: {len(by_chapter)} | Regions: {len(by_region)} | Divisions: {len(by_division)}")
+    accumulators = ingest.accumulators
+    ingest.store.close(accumulators["county_meta"], demographics)
+    print(f"\nProcessed: {ingest.processed:,} | Skipped: {ingest.skipped}")
+    print(f"Totals: {accumulators['totals']}")
+    print(f"ZIP matches: {ingest.zip_match_count:,} ({ingest.zip_match_count/ingest.processed*100:.1f}%)")
+    print(f"Counties: {len(accumulators['by_county'])} | Chapters: {len(accumulators['by_chapter'])} | "
+          f"Regions: {len(accumulators['by_region'])} | Divisions: {len(accumulators['by_division'])}")
+
+    write_outputs(ingest, demographics)
+    ingest.points.close()
+
+    print(f"\nAll JSON files written to {OUTPUT_DIR}/")
+    for f in os.listdir(OUTPUT_DIR):
+        if f.endswith(".json"):
+            size = os.path.getsize(os.path.join(OUTPUT_DIR, f))
+            print(f"  {f}: {size:,} bytes")
+
+
+def write_outputs(ingest, demographics, output_dir=None):
+    """Write fires-points.json, every rollup and the /report bundles for a finished Ingest.
+
+    Goes to OUTPUT_DIR unless output_dir is given (watch.py stages into a scratch dir). Returns the rollups.
+    """
+    from report_bundles import load_top_departments, write_report_bundles
+
+    output_dir = output_dir or OUTPUT_DIR
 
     # === Write JSON files ===
 
     # 1. fires-points.json (flat arrays for deck.gl, now with chapter/region indices)
-    points_data = {
-        "lat": points_lat,
-        "lon": points_lon,
-        "cat": points_cat,
-        "svi": points_svi,
-        "month": points_month,
-        "ch": points_chapter,
-        "rg": points_region,
-        "fips": points_fips,
-        "chapters": chapter_list,
-        "regions": region_list,
-        "count": len(points_lat),
-    }
-    write_json("fires-points.json", points_data)
+    # Streamed from the point columns (spill files in low-memory mode) instead of one big dict
+    ingest.points.write_json(os.path.join(output_dir, "fires-points.json"), ingest.chapter_list, ingest.region_list)
+    print("  Wrote fires-points.json")
+
+    rollups = build_rollups(ingest.accumulators, demographics)
+    for filename, data in rollups.items():
+        write_json(filename, data, output_dir)
+
+    # Per-entity /report bundles (top departments come from the event store written above)
+    write_report_bundles(
+        rollups["by-county.json"],
+        rollups["peers.json"],
+        load_top_departments(),
+        reports_dir=os.path.join(output_dir, "reports"),
+    )
+    return rollups
+
+
+def build_rollups(acc, demographics, names=None):
+    """Build every dashboard rollup (except fires-points) from filled accumulators.
+
+    Returns an ordered dict of output filename → JSON-serializable data. With names, the
+    derived outputs (peers.json, geo-metrics.json, search-index-{kind}.json) are only built
+    if listed there; the plain rollups are cheap and always included.
+    """
+    totals = acc["totals"]
+    svi_sum = acc["svi_sum"]
+    svi_count = acc["svi_count"]
+    monthly = acc["monthly"]
+    daily = acc["daily"]
+    by_state = acc["by_state"]
+    by_dept = acc["by_dept"]
+    by_county = acc["by_county"]
+    by_chapter = acc["by_chapter"]
+    by_region = acc["by_region"]
+    by_division = acc["by_division"]
+    county_meta = acc["county_meta"]
+    svi_bins_total = acc["svi_bins_total"]
+    svi_bins_gap = acc["svi_bins_gap"]
+    funnel = acc["funnel"]
+    outputs = {}
 
     # 2. summary.json
     avg_svi = round(svi_sum / svi_count, 3) if svi_count > 0 else 0
@@ -517,7 +623,7 @@ def main():
         "uniqueDepartments": len(by_dept),
         "statesCovered": len(by_state),
     }
-    write_json("summary.json", summary)
+    outputs["summary.json"] = summary
 
     # 3. funnel.json
     funnel_data = {
@@ -528,7 +634,7 @@ def main():
             {"label": "RC Care Provided", "value": funnel["rc_care"], "color": "#ED1B2E"},
         ]
     }
-    write_json("funnel.json", funnel_data)
+    outputs["funnel.json"] = funnel_data
 
     # 4. by-state.json
     states_out = []
@@ -557,7 +663,7 @@ def main():
             "avgSvi": avg,
             "monthly": monthly_sorted,
         })
-    write_json("by-state.json", states_out)
+    outputs["by-state.json"] = states_out
 
     # 5. by-month.json
     months_out = []
@@ -570,7 +676,7 @@ def main():
             "gap": md["gap"],
             "total": md["total"],
         })
-    write_json("by-month.json", months_out)
+    outputs["by-month.json"] = months_out
 
     # 6. by-day.json
     days_out = []
@@ -583,7 +689,7 @@ def main():
             "gap": dd["gap"],
             "total": dd["total"],
         })
-    write_json("by-day.json", days_out)
+    outputs["by-day.json"] = days_out
 
     # 7. by-department.json
     depts_out = []
@@ -603,7 +709,7 @@ def main():
             "avgSvi": avg,
             "gapScore": gap_score,
         })
-    write_json("by-department.json", depts_out)
+    outputs["by-department.json"] = depts_out
 
     # 8. gap-analysis.json (by state, sorted by opportunity score)
     gap_out = []
@@ -622,7 +728,7 @@ def main():
             "careRate": round(data["care"] / data["total"] * 100, 1) if data["total"] > 0 else 0,
         })
     gap_out.sort(key=lambda x: -x["opportunityScore"])
-    write_json("gap-analysis.json", gap_out)
+    outputs["gap-analysis.json"] = gap_out
 
     # 9. risk-distribution.json
     risk_dist = {
@@ -630,7 +736,7 @@ def main():
         "total": svi_bins_total,
         "gap": svi_bins_gap,
     }
-    write_json("risk-distribution.json", risk_dist)
+    outputs["risk-distribution.json"] = risk_dist
 
     # === New Phase 2: Org Hierarchy JSON files ===
 
@@ -693,7 +799,7 @@ def main():
             "firesPer10k": round(total / pop * 10000, 1) if pop > 0 else 0,
         }
     county_out = build_org_output(by_county, county_meta_fn)
-    write_json("by-county.json", county_out)
+    outputs["by-county.json"] = county_out
 
     # 11. by-chapter.json
     def chapter_meta_fn(chapter_name):
@@ -707,7 +813,7 @@ def main():
             "firesPer10k": round(total / pop * 10000, 1) if pop > 0 else 0,
         }
     chapter_out = build_org_output(by_chapter, chapter_meta_fn)
-    write_json("by-chapter.json", chapter_out)
+    outputs["by-chapter.json"] = chapter_out
 
     # 12. by-region.json
     def region_meta_fn(region_name):
@@ -720,7 +826,7 @@ def main():
             "firesPer10k": round(total / pop * 10000, 1) if pop > 0 else 0,
         }
     region_out = build_org_output(by_region, region_meta_fn)
-    write_json("by-region.json", region_out)
+    outputs["by-region.json"] = region_out
 
     # 13. by-division.json
     def division_meta_fn(div_name):
@@ -733,22 +839,92 @@ def main():
             "firesPer10k": round(total / pop * 10000, 1) if pop > 0 else 0,
         }
     division_out = build_org_output(by_division, division_meta_fn)
-    write_json("by-division.json", division_out)
+    outputs["by-division.json"] = division_out
 
-    print(f"\nAll JSON files written to {OUTPUT_DIR}/")
-    for f in os.listdir(OUTPUT_DIR):
-        if f.endswith(".json"):
-            size = os.path.getsize(os.path.join(OUTPUT_DIR, f))
-            print(f"  {f}: {size:,} bytes")
+    def wanted(filename):
+        return names is None or filename in names
+
+    # 14. peers.json — k nearest comparable counties/chapters for entity reports
+    if wanted("peers.json"):
+        outputs["peers.json"] = build_peer_index(county_out, chapter_out)
+
+    # Choropleth TopoJSON feature ids + state names, read once for both outputs below
+    search_kinds = [kind for kind in SEARCH_KINDS if wanted(search_index_filename(kind))]
+    if wanted("geo-metrics.json") or "state" in search_kinds:
+        geo = load_geo_features()
+
+    # 15. geo-metrics.json — choropleth values pre-joined to TopoJSON features
+    if wanted("geo-metrics.json"):
+        outputs["geo-metrics.json"] = build_geo_metrics(county_out, states_out, geo["county_ids"], geo["state_ids"])
+
+    # 16. search-index-{kind}.json — ranked prefix/trigram typeahead index, one file per entity kind
+    if search_kinds:
+        outputs.update(build_search_indexes(
+            county_out, chapter_out, region_out, division_out, states_out, depts_out,
+            geo["state_names"] if "state" in search_kinds else None, kinds=search_kinds,
+        ))
+
+    return outputs
+
+
+def _feature_arrays(feature_ids, rows_by_id):
+    """Metric arrays aligned to feature_ids (null where a feature has no fires) + per-metric max."""
+    layer = {"count": len(feature_ids)}
+    for metric in GEO_METRICS:
+        layer[metric] = [rows_by_id[fid][metric] if fid in rows_by_id else None for fid in feature_ids]
+    layer["max"] = {
+        metric: max((v for v in layer[metric] if v is not None), default=0) for metric in GEO_METRICS
+    }
+    return layer
+
+
+def load_geo_features():
+    """Feature ids (in geometry order) of the county/state choropleth TopoJSON + state abbreviation → name."""
+    with open(os.path.join(GEO_DIR, "counties-albers-10m.json"), "r") as f:
+        county_ids = [g["id"] for g in json.load(f)["objects"]["counties"]["geometries"]]
+    with open(os.path.join(GEO_DIR, "states-albers-10m.json"), "r") as f:
+        state_geometries = json.load(f)["objects"]["states"]["geometries"]
+    return {
+        "county_ids": county_ids,
+        "state_ids": [g["id"] for g in state_geometries],
+        "state_names": {
+            FIPS_TO_STATE[g["id"]]: g["properties"]["name"] for g in state_geometries if g["id"] in FIPS_TO_STATE
+        },
+    }
+
+
+def build_geo_metrics(county_out, states_out, county_ids, state_ids):
+    """Join county/state rollups to the choropleth TopoJSON geometries, in geometry order.
+
+    The client can then color feature i with counties[metric][i] — no FIPS map or per-feature lookup.
+    """
+    counties_by_fips = {c["fips"]: c for c in county_out}
+
+    # State firesPer10k uses the population of the state's counties with fires (as chapters do)
+    state_pop = defaultdict(int)
+    for c in county_out:
+        state_pop[c["state"]] += c["population"]
+    state_to_fips = {abbr: f for f, abbr in FIPS_TO_STATE.items()}
+    states_by_fips = {}
+    for s in states_out:
+        fips = state_to_fips.get(s["state"])
+        if fips:
+            pop = state_pop[s["state"]]
+            states_by_fips[fips] = dict(s, firesPer10k=round(s["total"] / pop * 10000, 1) if pop > 0 else 0)
+
+    return {
+        "counties": _feature_arrays(county_ids, counties_by_fips),
+        "states": _feature_arrays(state_ids, states_by_fips),
+    }
 
 
-def write_json(filename, data):
+def write_json(filename, data, output_dir=None):
     """Write JSON file to output directory."""
-    path = os.path.join(OUTPUT_DIR, filename)
+    path = os.path.join(output_dir or OUTPUT_DIR, filename)
     with open(path, "w") as f:
         json.dump(data, f, separators=(",", ":"))
     print(f"  Wrote {filename}")
 
 
 if __name__ == "__main__":
-    main()
+    main(low_memory="--low-memory" in sys.argv[1:])
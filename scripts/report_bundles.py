@@ -0,0 +1,431 @@
+"""
+FLARE Analytics Report Bundles
+Pre-builds the /report page data for every division, region, chapter and county, so a report
+is one small fetch instead of downloading by-county.json and aggregating in the browser.
+
+Writes public/data/reports/{level}/{slug}.json in the ReportData shape of lib/report-data.ts
+(minus generatedAt, which the page stamps at render time), plus:
+  - topDepartments: top fire departments by volume (from the event store, if present)
+  - peerBasis: "profile" for counties/chapters (k-nearest peers from peers.json) or
+               "volume" for regions/divisions (similar fire totals, as before)
+
+Aggregation mirrors lib/aggregator.ts + lib/svi.ts, including JS toFixed()/Math.round()
+rounding, so bundles match what the browser would have computed. Bundles are built across a
+process pool into reports.tmp/, which then replaces reports/ whole so bundles for renamed or
+dropped entities don't linger. The bundles are committed alongside the other public/data outputs;
+re-run this script (or prepare_data.py) whenever by-county.json or peers.json change.
+
+Usage:
+  python scripts/report_bundles.py [--workers N]   # from the JSON already in public/data
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sqlite3
+import time
+from decimal import ROUND_HALF_UP, Decimal
+from multiprocessing import Pool
+
+from prepare_data import EVENT_STORE_FILE, OUTPUT_DIR, SCRIPTS_DIR
+
+REPORTS_DIR = os.path.join(OUTPUT_DIR, "reports")
+STATION_COUNTS_FILE = os.path.join(SCRIPTS_DIR, "fire_station_counts.json")
+DATA_DATE = "Calendar Year 2024"
+TOP_DEPARTMENTS = 10
+
+SVI_QUINTILES = [
+    ("Very Low", (0, 0.2)),
+    ("Low", (0.2, 0.4)),
+    ("Moderate", (0.4, 0.6)),
+    ("High", (0.6, 0.8)),
+    ("Very High", (0.8, 1.0)),
+]
+
+# Worker state (set by _init_worker)
+_counties = None
+_by_fips = None
+_by_level = None
+_national = None
+_peers = None
+_departments = None
+_reports_dir = None
+
+
+def report_slug(name):
+    """File name for an entity — keep in sync with reportSlug() in lib/data-loader.ts."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def _fixed(x, digits):
+    """+x.toFixed(digits): half-up on the exact binary value."""
+    return float(Decimal(x).quantize(Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP))
+
+
+def _js_round(x):
+    """Math.round(x) for x >= 0."""
+    return int(Decimal(x).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def _js_str(x):
+    """Number → string the way a JS template literal prints it (45.0 → "45")."""
+    return str(int(x)) if float(x).is_integer() else repr(float(x))
+
+
+def aggregate(name, counties):
+    """Port of buildAggregatedRow() in lib/aggregator.ts."""
+    total = care = notification = gap = 0
+    population = households = poverty = station_count = 0
+    income_sum = income_count = age_sum = age_count = 0
+    diversity_sum = diversity_count = home_sum = home_count = 0
+    svi_sum = svi_weight = 0
+    monthly = {}
+    for c in counties:
+        total += c["total"]
+        care += c["care"]
+        notification += c["notification"]
+        gap += c["gap"]
+        population += c.get("population") or 0
+        households += c.get("households") or 0
+        poverty += c.get("poverty") or 0
+        station_count += c.get("stationCount") or 0
+        if c["medianIncome"] > 0:
+            income_sum += c["medianIncome"] * c["total"]
+            income_count += c["total"]
+        if c["medianAge"] > 0:
+            age_sum += c["medianAge"] * c["total"]
+            age_count += c["total"]
+        if c["diversityIndex"] > 0:
+            diversity_sum += c["diversityIndex"] * c["total"]
+            diversity_count += c["total"]
+        if c["homeValue"] > 0:
+            home_sum += c["homeValue"] * c["total"]
+            home_count += c["total"]
+        if c["avgSvi"] > 0 and c["total"] > 0:
+            svi_sum += c["avgSvi"] * c["total"]
+            svi_weight += c["total"]
+        for m in c["monthly"]:
+            acc = monthly.setdefault(m["month"], {"care": 0, "notification": 0, "gap": 0, "total": 0})
+            for key in acc:
+                acc[key] += m[key]
+
+    income = income_sum / income_count if income_count > 0 else 0
+    home = home_sum / home_count if home_count > 0 else 0
+    return {
+        "name": name,
+        "total": total,
+        "care": care,
+        "notification": notification,
+        "gap": gap,
+        "careRate": care / total * 100 if total > 0 else 0,
+        "gapRate": gap / total * 100 if total > 0 else 0,
+        "avgSvi": svi_sum / svi_weight if svi_weight > 0 else 0,
+        "population": population,
+        "households": households,
+        "poverty": poverty,
+        "medianIncome": _js_round(income) if income_count > 0 else 0,
+        "medianAge": _fixed(age_sum / age_count, 1) if age_count > 0 else 0,
+        "diversityIndex": _fixed(diversity_sum / diversity_count, 1) if diversity_count > 0 else 0,
+        "homeValue": _js_round(home) if home_count > 0 else 0,
+        "firesPer10k": _fixed(total / population * 10000, 1) if population > 0 else 0,
+        "povertyRate": _fixed(poverty / population * 100, 1) if population > 0 else 0,
+        "affordabilityRatio": _fixed(home / income, 1) if income_count > 0 and income > 0 else 0,
+        "stationCount": station_count,
+        "countyCount": len(counties),
+        "monthly": [{"month": m, **d} for m, d in sorted(monthly.items())],
+    }
+
+
+def to_peer(row):
+    return {key: row[key] for key in (
+        "name", "total", "careRate", "gapRate", "avgSvi", "population",
+        "firesPer10k", "povertyRate", "medianIncome", "stationCount",
+    )}
+
+
+def county_peer(c):
+    """PeerEntity for a single county row."""
+    pop = c["population"]
+    return {
+        "name": f"{c['county']}, {c['state']}",
+        "total": c["total"],
+        "careRate": c["careRate"],
+        "gapRate": c["gapRate"],
+        "avgSvi": c["avgSvi"],
+        "population": pop,
+        "firesPer10k": c["firesPer10k"],
+        "povertyRate": _fixed(c["poverty"] / pop * 100, 1) if pop > 0 else 0,
+        "medianIncome": c["medianIncome"],
+        "stationCount": c.get("stationCount") or 0,
+    }
+
+
+def bucket_by_svi(counties):
+    """Port of bucketBySvi() in lib/svi.ts."""
+    buckets = []
+    for label, (lo, hi) in SVI_QUINTILES:
+        bucket = [c for c in counties if c["avgSvi"] >= lo and (c["avgSvi"] <= hi if hi == 1.0 else c["avgSvi"] < hi)]
+        total = sum(c["total"] for c in bucket)
+        care = sum(c["care"] for c in bucket)
+        gap = sum(c["gap"] for c in bucket)
+        buckets.append({
+            "label": label,
+            "range": [lo, hi],
+            "total": total,
+            "care": care,
+            "gap": gap,
+            "careRate": _fixed(care / total * 100, 1) if total > 0 else 0,
+            "gapRate": _fixed(gap / total * 100, 1) if total > 0 else 0,
+            "population": sum(c.get("population") or 0 for c in bucket),
+            "countyCount": len(bucket),
+        })
+    return buckets
+
+
+def equity_gap(quintiles):
+    """Port of computeEquityGap() in lib/svi.ts → (ratio, narrative)."""
+    with_fires = [q for q in quintiles if q["total"] > 0]
+    if len(with_fires) < 2:
+        return 1, "Insufficient data for equity analysis."
+    lowest, highest = with_fires[0], with_fires[-1]
+    ratio = _fixed(highest["gapRate"] / lowest["gapRate"], 2) if lowest["gapRate"] > 0 else 0
+    hi_rate, lo_rate, r = _js_str(highest["gapRate"]), _js_str(lowest["gapRate"]), _js_str(ratio)
+    if ratio > 1.5:
+        narrative = (f"Highest-vulnerability communities have a {hi_rate}% gap rate vs {lo_rate}% in "
+                     f"lowest-vulnerability areas — a {r}x equity gap. {highest['countyCount']} counties with "
+                     f"Very High SVI account for {highest['gap']:,} missed fires.")
+    elif ratio > 1.1:
+        narrative = f"Moderate equity gap: {hi_rate}% gap rate in highest-SVI vs {lo_rate}% in lowest-SVI communities ({r}x)."
+    else:
+        narrative = f"Gap rates are relatively equitable across SVI quintiles ({r}x ratio)."
+    return ratio, narrative
+
+
+def _county_list(counties):
+    return [
+        {
+            "name": f"{c['county']}, {c['state']}",
+            "fips": c["fips"],
+            "total": c["total"],
+            "careRate": c["careRate"],
+            "gapRate": c["gapRate"],
+            "stationCount": c.get("stationCount") or 0,
+        }
+        for c in sorted(counties, key=lambda c: -c["total"])
+    ]
+
+
+def _profile_peers(level, key):
+    layer = _peers.get(level) if _peers else None
+    if not layer or key not in layer["index"]:
+        return []
+    i, k = layer["index"][key], layer["k"]
+    return [layer["ids"][j] for j in layer["peers"][i * k:(i + 1) * k]]
+
+
+def _volume_peers(level, name, total, window):
+    rows = [r for key, r in _by_level[level].items() if key != name]
+    if window:
+        rows = [r for r in rows if total * 0.5 <= r["total"] <= total * 1.5]
+    rows.sort(key=lambda r: abs(r["total"] - total))
+    return [to_peer(r) for r in rows[:5]]
+
+
+def build_bundle(level, key):
+    """ReportData-shaped dict for one entity (key = name, or FIPS for counties)."""
+    if level == "county":
+        county = _by_fips[key]
+        entity_counties = [county]
+        agg = aggregate(f"{county['county']}, {county['state']}", entity_counties)
+        # Single-county KPIs come straight from the county row (as buildCountyReport does)
+        for field in ("careRate", "gapRate", "avgSvi", "firesPer10k", "medianIncome", "homeValue",
+                      "medianAge", "diversityIndex"):
+            agg[field] = county[field]
+        agg["affordabilityRatio"] = (
+            _fixed((county["homeValue"] or 0) / county["medianIncome"], 1) if county["medianIncome"] > 0 else 0
+        )
+        agg["monthly"] = county["monthly"]
+        parent = _by_level["chapter"].get(county["chapter"])
+        peers = [county_peer(_by_fips[fips]) for fips in _profile_peers("county", key)]
+        hierarchy = {"chapter": county["chapter"], "region": county["region"],
+                     "division": county["division"], "state": county["state"]}
+        peer_basis = "profile"
+    else:
+        entity_counties = [c for c in _counties if c[level] == key]
+        agg = _by_level[level][key]
+        first = entity_counties[0]
+        if level == "chapter":
+            parent = _by_level["region"].get(first["region"])
+            peers = [to_peer(_by_level["chapter"][name]) for name in _profile_peers("chapter", key)]
+            hierarchy = {"chapter": key, "region": first["region"], "division": first["division"]}
+            peer_basis = "profile"
+        else:
+            parent = None
+            peers = _volume_peers(level, key, agg["total"], window=level == "region")
+            hierarchy = {"region": key, "division": first["division"]} if level == "region" else {"division": key}
+            peer_basis = "volume"
+
+    quintiles = bucket_by_svi(entity_counties)
+    ratio, narrative = equity_gap(quintiles)
+    station_count = agg["stationCount"]
+    bundle = {
+        "entityName": agg["name"],
+        "entityLevel": level,
+        "dataDate": DATA_DATE,
+        **hierarchy,
+        **{k: agg[k] for k in (
+            "total", "care", "notification", "gap", "careRate", "gapRate", "avgSvi", "firesPer10k",
+            "population", "households", "medianIncome", "povertyRate", "homeValue", "medianAge",
+            "diversityIndex", "affordabilityRatio",
+        )},
+        "stationCount": station_count,
+        "firesPerStation": _fixed(agg["total"] / station_count, 1) if station_count > 0 else 0,
+        "monthly": agg["monthly"],
+        "quintiles": quintiles,
+        "equityNarrative": narrative,
+        "equityGap": ratio,
+        "countyCount": len(entity_counties),
+        "counties": _county_list(entity_counties),
+        "national": to_peer(_national),
+        "peers": peers,
+        "peerBasis": peer_basis,
+        "topDepartments": (_departments or {}).get(level, {}).get(key, []),
+        "missingDemographics": sum(1 for c in entity_counties if not c.get("population")),
+        "missingStations": sum(1 for c in entity_counties if not c.get("stationCount")),
+    }
+    if parent:
+        bundle["parentRegion"] = to_peer(parent)
+    return bundle
+
+
+def load_top_departments(store_path=EVENT_STORE_FILE, limit=TOP_DEPARTMENTS):
+    """{level: {key: [department rows]}} from the event store ({} if it hasn't been built)."""
+    if not os.path.exists(store_path):
+        return {}
+    conn = sqlite3.connect(f"file:{store_path}?mode=ro", uri=True)
+    key_sql = {
+        "county": ("e.fips", "e.fips IS NOT NULL"),
+        "chapter": ("(SELECT name FROM chapters WHERE id = e.chapter_id)", "e.chapter_id IS NOT NULL"),
+        "region": ("(SELECT name FROM regions WHERE id = e.region_id)", "e.region_id IS NOT NULL"),
+        "division": ("(SELECT name FROM divisions WHERE id = e.division_id)", "e.division_id IS NOT NULL"),
+    }
+    out = {}
+    for level, (key_expr, cond) in key_sql.items():
+        rows = conn.execute(
+            f"SELECT {key_expr} AS k, d.name, COUNT(*) AS n, TOTAL(e.label = 0), TOTAL(e.label = 1), TOTAL(e.label = 2) "
+            f"FROM events e JOIN departments d ON d.id = e.dept_id "
+            f"WHERE {cond} AND d.name != 'Unknown' GROUP BY k, e.dept_id ORDER BY k, n DESC, d.id"
+        )
+        level_out = out.setdefault(level, {})
+        for key, name, n, care, notification, gap in rows:
+            depts = level_out.setdefault(key, [])
+            if len(depts) < limit:
+                depts.append({
+                    "name": name,
+                    "total": n,
+                    "care": int(care),
+                    "notification": int(notification),
+                    "gap": int(gap),
+                    "careRate": round(care / n * 100, 1),
+                    "gapRate": round(gap / n * 100, 1),
+                })
+    conn.close()
+    return out
+
+
+def _index_peers(peer_index):
+    if not peer_index:
+        return None
+    return {
+        level: dict(layer, index={key: i for i, key in enumerate(layer["ids"])})
+        for level, layer in (("county", peer_index["counties"]), ("chapter", peer_index["chapters"]))
+    }
+
+
+def _init_worker(counties, peer_index, departments, reports_dir):
+    global _counties, _by_fips, _by_level, _national, _peers, _departments, _reports_dir
+    _reports_dir = reports_dir
+    _counties = counties
+    _by_fips = {c["fips"]: c for c in counties}
+    _peers = _index_peers(peer_index)
+    _departments = departments
+    _national = aggregate("National", counties)
+    _by_level = {}
+    for level in ("division", "region", "chapter"):
+        groups = {}
+        for c in counties:
+            if c[level]:
+                groups.setdefault(c[level], []).append(c)
+        _by_level[level] = {name: aggregate(name, group) for name, group in groups.items()}
+
+
+def _write_task(task):
+    level, key = task
+    slug = key if level == "county" else report_slug(key)
+    path = os.path.join(_reports_dir, level, f"{slug}.json")
+    with open(path, "w") as f:
+        json.dump(build_bundle(level, key), f, separators=(",", ":"))
+    return os.path.getsize(path)
+
+
+def write_report_bundles(county_rows, peer_index=None, departments=None, workers=None, reports_dir=None):
+    """Write one bundle per division/region/chapter/county with fires. Returns # of files."""
+    start = time.perf_counter()
+    reports_dir = reports_dir or REPORTS_DIR
+    if os.path.exists(STATION_COUNTS_FILE):
+        with open(STATION_COUNTS_FILE, "r") as f:
+            station_counts = json.load(f)
+        county_rows = [dict(c, stationCount=station_counts.get(c["fips"], 0)) for c in county_rows]
+
+    tasks = [("county", c["fips"]) for c in county_rows]
+    for level in ("division", "region", "chapter"):
+        names = list(dict.fromkeys(c[level] for c in county_rows if c[level]))
+        slugs = {}
+        for name in names:
+            slug = report_slug(name)
+            if slug in slugs:
+                raise ValueError(f"Report slug collision: {name!r} and {slugs[slug]!r} → {slug}")
+            slugs[slug] = name
+        tasks.extend((level, name) for name in names)
+
+    # Build into a fresh directory and swap it in whole, so bundles for renamed or dropped
+    # entities don't linger from an earlier run
+    staging = reports_dir + ".tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    for level in ("division", "region", "chapter", "county"):
+        os.makedirs(os.path.join(staging, level))
+    initargs = (county_rows, peer_index, departments, staging)
+    with Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        total_bytes = sum(pool.imap_unordered(_write_task, tasks, chunksize=64))
+    old = reports_dir + ".old"
+    shutil.rmtree(old, ignore_errors=True)
+    if os.path.exists(reports_dir):
+        os.rename(reports_dir, old)
+    os.rename(staging, reports_dir)
+    shutil.rmtree(old, ignore_errors=True)
+    print(f"  Wrote {len(tasks):,} report bundles ({total_bytes:,} bytes) in {time.perf_counter() - start:.1f}s")
+    return len(tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    args = parser.parse_args()
+
+    with open(os.path.join(OUTPUT_DIR, "by-county.json"), "r") as f:
+        county_rows = json.load(f)
+    peers_path = os.path.join(OUTPUT_DIR, "peers.json")
+    peer_index = None
+    if os.path.exists(peers_path):
+        with open(peers_path, "r") as f:
+            peer_index = json.load(f)
+    departments = load_top_departments()
+    if not departments:
+        print("  Event store not found — bundles will have no topDepartments")
+    write_report_bundles(county_rows, peer_index, departments, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
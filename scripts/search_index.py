@@ -0,0 +1,100 @@
+"""
+FLARE Analytics Search Index
+Precomputes a typeahead index over every searchable entity — counties, chapters, regions,
+divisions, states and fire departments — so SearchSelect can answer a query with a few
+sorted-list intersections instead of loading by-county.json / by-department.json and
+scanning every name.
+
+Each kind gets its own file (search-index-{kind}.json), so a picker only downloads the names
+it searches — the county picker never pays for the ~6k department names, and vice versa.
+Within a file, entries are ranked by fire volume (entry id 0 = most fires), so every postings
+list is already in rank order and the first matches found are the best ones. Labels are
+normalized the same way as normalizeSearch() in lib/search-index.ts (accents stripped,
+lowercase, runs of non-alphanumerics → one space), then indexed two ways:
+  - prefixes: 1- and 2-character word starts (queries shorter than a trigram)
+  - trigrams: every 3-character substring of each word
+
+Output shape (search-index-{kind}.json):
+  {"kind": "county",
+   "entries": {"label": [...], "value": [null | value, ...], "total": [...]},
+   "prefixes": {"co": [delta-encoded ids]},
+   "trigrams": {"coo": [delta-encoded ids]}}
+value is null when it equals the label (everything except counties and states).
+Postings are delta-encoded (first id, then gaps) to keep the files small.
+"""
+
+import re
+import unicodedata
+
+SEARCH_KINDS = ("county", "chapter", "region", "division", "state", "department")
+
+
+def search_index_filename(kind):
+    return f"search-index-{kind}.json"
+
+
+def normalize_search(text):
+    """Keep in sync with normalizeSearch() in lib/search-index.ts."""
+    text = re.sub("[\u0300-\u036f]", "", unicodedata.normalize("NFKD", text))
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def _delta(ids):
+    prev = 0
+    out = []
+    for i in ids:
+        out.append(i - prev)
+        prev = i
+    return out
+
+
+def _build_kind_index(kind, entities):
+    """Index one kind's (label, value, total) entities."""
+    # Stable sort: ties keep rollup order
+    entities = sorted(entities, key=lambda e: -e[2])
+
+    entries = {"label": [], "value": [], "total": []}
+    prefixes = {}
+    trigrams = {}
+    for i, (label, value, total) in enumerate(entities):
+        entries["label"].append(label)
+        entries["value"].append(value)
+        entries["total"].append(total)
+        for word in normalize_search(label).split():
+            for key in {word[:1], word[:2]}:
+                postings = prefixes.setdefault(key, [])
+                if not postings or postings[-1] != i:
+                    postings.append(i)
+            for j in range(len(word) - 2):
+                postings = trigrams.setdefault(word[j:j + 3], [])
+                if not postings or postings[-1] != i:
+                    postings.append(i)
+
+    return {
+        "kind": kind,
+        "entries": entries,
+        "prefixes": {key: _delta(ids) for key, ids in sorted(prefixes.items())},
+        "trigrams": {key: _delta(ids) for key, ids in sorted(trigrams.items())},
+    }
+
+
+def build_search_indexes(county_out, chapter_out, region_out, division_out, states_out, depts_out,
+                         state_names=None, kinds=SEARCH_KINDS):
+    """Build {search-index-{kind}.json: index} for the given kinds from the rollup rows.
+
+    state_names maps abbreviation → full name.
+    """
+    state_names = state_names or {}
+    entities = {
+        "county": [(f"{c['county']}, {c['state']}", c["fips"], c["total"]) for c in county_out],
+        "chapter": [(r["name"], None, r["total"]) for r in chapter_out],
+        "region": [(r["name"], None, r["total"]) for r in region_out],
+        "division": [(r["name"], None, r["total"]) for r in division_out],
+        "state": [
+            (f"{state_names[s['state']]} ({s['state']})" if s["state"] in state_names else s["state"],
+             s["state"], s["total"])
+            for s in states_out
+        ],
+        "department": [(d["name"], None, d["total"]) for d in depts_out if d["name"] != "Unknown"],
+    }
+    return {search_index_filename(kind): _build_kind_index(kind, entities[kind]) for kind in kinds}
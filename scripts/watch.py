@@ -0,0 +1,253 @@
+"""
+FLARE Analytics Watch Mode
+Long-running alternative to re-running prepare_data.py by hand whenever a new Match Map.xlsx
+export lands. Keeps the lookup tables and the last Ingest (accumulators, map points,
+chapter/region indexes) in memory, polls the workbook and side files, and on a change redoes
+only the work that change needs:
+
+  Match Map.xlsx              rows appended to the previous export → only the new rows are
+                              ingested; an edited or re-sorted export is caught at its first
+                              differing row (each ingested row's hash is kept) → full ingest
+  ZIP lookup / ARC mapping    lookups reloaded + full ingest (any row's enrichment can change)
+  county_demographics.json    lookups reloaded, rollups rebuilt from the warm accumulators
+  fire_station_counts.json    report bundles only
+  geo/*-albers-10m.json       rollups only (geo-metrics, state names)
+
+The workbook itself still has to be parsed on every change (openpyxl can't seek), but
+interpreter startup and lookup loading are paid once, and rows already ingested skip
+enrichment, accumulation and the event-store insert. A changed file is only picked up once
+its size and mtime have held still for one poll interval, since exports are written in place.
+
+Outputs are staged in public/data.staging (same filesystem) and moved into public/data with
+os.replace — one rename per file, and reports/ swapped as a directory — so the dashboard never
+reads a half-written file. Watch mode keeps map points in memory (no --low-memory).
+
+Usage:
+  python scripts/watch.py                 # full build, then poll every 2s (Ctrl-C to stop)
+  python scripts/watch.py --interval 10
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import time
+import traceback
+
+from event_store import EventStoreWriter
+from lookup_cache import SOURCES, load_lookups
+from point_columns import PointColumns
+from prepare_data import (
+    EVENT_STORE_FILE, GEO_DIR, INPUT_FILE, OUTPUT_DIR, Ingest, build_rollups, ingest_rows, write_json,
+    write_outputs,
+)
+from report_bundles import STATION_COUNTS_FILE, load_top_departments, write_report_bundles
+
+STAGING_DIR = OUTPUT_DIR + ".staging"
+
+# Watched name → files (a name counts as changed if any of its files did)
+WATCHED = {
+    "workbook": (INPUT_FILE,),
+    "zip": (SOURCES["zip"],),
+    "arc": (SOURCES["arc"],),
+    "demographics": (SOURCES["demographics"],),
+    "stations": (STATION_COUNTS_FILE,),
+    "geo": (os.path.join(GEO_DIR, "counties-albers-10m.json"), os.path.join(GEO_DIR, "states-albers-10m.json")),
+}
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def stamps():
+    return {name: tuple(_stamp(p) for p in paths) for name, paths in WATCHED.items()}
+
+
+def _row_hash(row):
+    return hashlib.blake2b(repr(row).encode("utf-8"), digest_size=8).digest()
+
+
+def swap_in(staging):
+    """Move staged outputs into OUTPUT_DIR: one os.replace per file, directories swapped whole."""
+    for name in sorted(os.listdir(staging)):
+        src = os.path.join(staging, name)
+        dst = os.path.join(OUTPUT_DIR, name)
+        if os.path.isdir(src):
+            old = dst + ".old"
+            shutil.rmtree(old, ignore_errors=True)
+            if os.path.exists(dst):
+                os.rename(dst, old)
+            os.rename(src, dst)
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            os.replace(src, dst)
+    shutil.rmtree(staging, ignore_errors=True)
+
+
+class Watcher:
+    """Warm pipeline state plus the incremental rebuild rules above."""
+
+    def __init__(self):
+        self.lookups = None
+        self.ingest = None
+        self.row_hashes = []  # header + every ingested data row, in workbook order
+        self.rollups = None
+
+    def load_lookups(self):
+        self.lookups = load_lookups()
+        print(f"  Lookups: {len(self.lookups.zip):,} ZIPs | {len(self.lookups.arc):,} ARC counties | "
+              f"{len(self.lookups.demographics):,} demographic counties")
+
+    def _open_rows(self):
+        import openpyxl
+
+        wb = openpyxl.load_workbook(INPUT_FILE, read_only=True, data_only=True)
+        rows = wb.active.iter_rows(values_only=True)
+        # Skip metadata rows (row 1 = filter text, row 2 = blank) — see prepare_data.main
+        next(rows)
+        next(rows)
+        return wb, rows
+
+    def _hashed(self, rows):
+        for row in rows:
+            self.row_hashes.append(_row_hash(row))
+            yield row
+
+    def _appended_rows(self):
+        """(workbook, iterator past the rows already ingested), or None if the export isn't a pure append."""
+        wb, rows = self._open_rows()
+        for i, expected in enumerate(self.row_hashes):
+            row = next(rows, None)
+            if row is None or _row_hash(row) != expected:
+                print(f"  Workbook differs from the last export at row {i + 3} — full ingest")
+                wb.close()
+                return None
+        return wb, rows
+
+    def ingest_workbook(self, full):
+        """Ingest the workbook into the warm state. Returns (# rows read, whether it was a full ingest)."""
+        opened = None if full or self.ingest is None else self._appended_rows()
+        if opened is None:
+            full = True
+            wb, rows = self._open_rows()
+            self.row_hashes = [_row_hash(next(rows))]  # header row
+            if self.ingest:
+                self.ingest.points.close()
+            self.ingest = Ingest(PointColumns(), EventStoreWriter(EVENT_STORE_FILE))
+        else:
+            wb, rows = opened
+            self.ingest.store = EventStoreWriter(EVENT_STORE_FILE, append=True)
+
+        before = self.ingest.processed + self.ingest.skipped
+        ingest_rows(self._hashed(rows), self.lookups.zip, self.lookups.arc, self.ingest)
+        wb.close()
+        self.ingest.store.close(self.ingest.accumulators["county_meta"], self.lookups.demographics)
+        read = self.ingest.processed + self.ingest.skipped - before
+        print(f"  {'Full ingest' if full else 'Appended'}: {read:,} rows | {self.ingest.processed:,} events total")
+        return read, full
+
+    def publish(self, points, rollups, reports):
+        """Write the requested outputs to the staging dir, then swap them into OUTPUT_DIR."""
+        shutil.rmtree(STAGING_DIR, ignore_errors=True)
+        os.makedirs(STAGING_DIR)
+        demographics = self.lookups.demographics
+        if points:
+            self.rollups = write_outputs(self.ingest, demographics, STAGING_DIR)
+        else:
+            if rollups:
+                self.rollups = build_rollups(self.ingest.accumulators, demographics)
+                for filename, data in self.rollups.items():
+                    write_json(filename, data, STAGING_DIR)
+            if reports:
+                write_report_bundles(
+                    self.rollups["by-county.json"],
+                    self.rollups["peers.json"],
+                    load_top_departments(),
+                    reports_dir=os.path.join(STAGING_DIR, "reports"),
+                )
+        swap_in(STAGING_DIR)
+
+    def handle(self, changed):
+        start = time.perf_counter()
+        print(f"\n[{time.strftime('%H:%M:%S')}] Changed: {', '.join(sorted(changed))}")
+
+        if changed & {"zip", "arc", "demographics"} or self.lookups is None:
+            self.load_lookups()
+
+        read, full = 0, False
+        if changed & {"zip", "arc"} or self.ingest is None:
+            read, full = self.ingest_workbook(full=True)
+        elif "workbook" in changed:
+            read, full = self.ingest_workbook(full=False)
+        elif "demographics" in changed:
+            # Only the event store's counties table carries demographics
+            EventStoreWriter(EVENT_STORE_FILE, append=True).close(
+                self.ingest.accumulators["county_meta"], self.lookups.demographics
+            )
+
+        points = full or read > 0
+        rollups = points or bool(changed & {"demographics", "geo"})
+        reports = points or "demographics" in changed or "stations" in changed
+        if not (points or rollups or reports):
+            print("  Nothing to rebuild (no new rows)")
+            return
+        self.publish(points, rollups, reports)
+        print(f"  Published to {OUTPUT_DIR} in {time.perf_counter() - start:.1f}s")
+
+    def run(self, interval):
+        current = stamps()
+        if current["workbook"][0] is None:
+            print(f"Waiting for {INPUT_FILE}...")
+        else:
+            self.handle(set(WATCHED))
+        seen = current
+        print(f"\nWatching {len(WATCHED)} inputs every {interval:g}s (Ctrl-C to stop)")
+        while True:
+            time.sleep(interval)
+            current = stamps()
+            changed = {name for name in WATCHED if current[name] != seen[name]}
+            if not changed:
+                continue
+            # Let in-progress writes settle: unchanged for one more poll
+            time.sleep(interval)
+            if stamps() != current:
+                continue
+            seen = current
+            if current["workbook"][0] is None:
+                print(f"Waiting for {INPUT_FILE}...")
+                continue
+            try:
+                self.handle(changed if self.ingest else set(WATCHED))
+            except Exception:
+                # Outputs are only swapped in after a complete build, so public/data is untouched;
+                # the warm state may be half-updated, so the next change does a full ingest
+                traceback.print_exc()
+                print("  Rebuild failed — keeping the previous outputs")
+                if self.ingest:
+                    self.ingest.points.close()
+                self.ingest = None
+                self.row_hashes = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interval", type=float, default=2.0, help="poll interval in seconds (default: 2)")
+    args = parser.parse_args()
+
+    watcher = Watcher()
+    try:
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        if watcher.ingest:
+            watcher.ingest.points.close()
+
+
+if __name__ == "__main__":
+    main()